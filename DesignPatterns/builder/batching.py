@@ -0,0 +1,38 @@
+from collections import deque
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def chunked(items: Iterable[T], chunk_size: int) -> Iterator[List[T]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def map_in_order(function: Callable[..., R], arguments: Iterable[Tuple], workers: int = 0) -> Iterator[R]:
+    """Yield ``function(*args)`` for each tuple in ``arguments``, in input order.
+
+    ``workers <= 0`` runs everything in this process. Otherwise the calls go to a process pool
+    with at most two per worker in flight, so memory stays bounded however long ``arguments`` is.
+    """
+    if workers <= 0:
+        for args in arguments:
+            yield function(*args)
+        return
+
+    # Imported here so serial callers don't pay for multiprocessing at import time
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for args in arguments:
+            pending.append(executor.submit(function, *args))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -1,10 +1,16 @@
 import json
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from array import array
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional
 
 
 # Product: The complex object to be built
 class Computer:
+    __slots__ = ("computer_type", "cpu", "motherboard", "ram", "storage", "graphics_card",
+                 "power_supply", "cooling_system", "price")
+
     def __init__(self, computer_type: str):
         self.computer_type = computer_type
         self.cpu = None
@@ -40,31 +46,163 @@ class Computer:
             "price": self.price
         }
 
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @staticmethod
+    def from_dict(data: Dict) -> "Computer":
+        computer = Computer(data["computer_type"])
+        computer.cpu = data.get("cpu")
+        computer.motherboard = data.get("motherboard")
+        computer.ram = data.get("ram")
+        computer.storage = data.get("storage")
+        computer.graphics_card = data.get("graphics_card")
+        computer.power_supply = data.get("power_supply")
+        computer.cooling_system = data.get("cooling_system")
+        computer.price = data.get("price", 0.0)
+        return computer
+
+    def copy(self) -> "Computer":
+        clone = Computer(self.computer_type)
+        clone.cpu = self.cpu
+        clone.motherboard = self.motherboard
+        clone.ram = self.ram
+        clone.storage = self.storage
+        clone.graphics_card = self.graphics_card
+        clone.power_supply = self.power_supply
+        clone.cooling_system = self.cooling_system
+        clone.price = self.price
+        return clone
+
+    def freeze(self) -> "FrozenComputer":
+        return FrozenComputer(self)
+
+
+# Immutable Product: Shared snapshot of a finished Computer; copy() it to customize
+class FrozenComputer(Computer):
+    __slots__ = ("_dict", "_json")
+
+    def __init__(self, computer: Computer):
+        for attribute in Computer.__slots__:
+            object.__setattr__(self, attribute, getattr(computer, attribute))
+        object.__setattr__(self, "_dict", Computer.to_dict(self))
+        object.__setattr__(self, "_json", json.dumps(self._dict))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"FrozenComputer is immutable; use copy() to change {name}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"FrozenComputer is immutable; use copy() to change {name}")
+
+    def __reduce__(self):
+        return FrozenComputer, (self.copy(),)
+
+    def to_dict(self) -> Dict:
+        return dict(self._dict)
+
+    def to_json(self) -> str:
+        return self._json
+
+    def freeze(self) -> "FrozenComputer":
+        return self
+
+
+# Catalog: Shared, read-only component data loaded once for every builder
+class ComponentCatalog:
+    def __init__(self, prices: Mapping[str, float],
+                 allowed_parts: Mapping[str, Mapping[str, Iterable[Optional[str]]]],
+                 compatible_motherboards: Mapping[str, Iterable[str]]):
+        # Each component gets an integer id; prices live in a compact array indexed by that id
+        self.component_names = tuple(prices)
+        self.component_ids = MappingProxyType({name: i for i, name in enumerate(self.component_names)})
+        self.prices = array("d", (prices[name] for name in self.component_names))
+        self.component_prices = MappingProxyType(dict(prices))
+        self.allowed_parts = MappingProxyType({
+            computer_type: MappingProxyType({category: frozenset(parts) for category, parts in categories.items()})
+            for computer_type, categories in allowed_parts.items()
+        })
+        self.compatible_motherboards = MappingProxyType(
+            {cpu: frozenset(boards) for cpu, boards in compatible_motherboards.items()}
+        )
+
+    def price(self, component: Optional[str]) -> float:
+        component_id = self.component_ids.get(component)
+        return self.prices[component_id] if component_id is not None else 0.0
+
+    def allowed(self, computer_type: str, category: str) -> FrozenSet[Optional[str]]:
+        return self.allowed_parts[computer_type][category]
+
+
+COMPONENT_CATALOG = ComponentCatalog(
+    prices={
+        "Intel Core i9-13900K": 600.00,
+        "AMD Ryzen 7 5800X": 350.00,
+        "Intel Core i5-12400": 200.00,
+        "ASUS ROG Z790": 400.00,
+        "Gigabyte B550": 150.00,
+        "ASUS TUF B660": 180.00,
+        "32GB DDR5": 200.00,
+        "16GB DDR4": 80.00,
+        "8GB DDR4": 40.00,
+        "1TB NVMe SSD": 100.00,
+        "2TB HDD": 60.00,
+        "512GB SSD": 50.00,
+        "NVIDIA RTX 4090": 1500.00,
+        "AMD Radeon RX 6700 XT": 400.00,
+        "Integrated Graphics": 0.00,
+        "850W PSU": 120.00,
+        "650W PSU": 80.00,
+        "Built-in Battery": 100.00,
+        "Liquid Cooling": 150.00,
+        "Air Cooling": 50.00
+    },
+    allowed_parts={
+        "Desktop": {
+            "cpu": ["Intel Core i9-13900K", "AMD Ryzen 7 5800X", "Intel Core i5-12400"],
+            "motherboard": ["ASUS ROG Z790", "Gigabyte B550", "ASUS TUF B660"],
+            "ram": ["32GB DDR5", "16GB DDR4", "8GB DDR4"],
+            "storage": ["1TB NVMe SSD", "2TB HDD", "512GB SSD"],
+            "graphics_card": [None, "NVIDIA RTX 4090", "AMD Radeon RX 6700 XT"],
+            "power_supply": ["850W PSU", "650W PSU"],
+            "cooling_system": ["Liquid Cooling", "Air Cooling"]
+        },
+        "Laptop": {
+            "cpu": ["Intel Core i5-12400"],
+            "motherboard": ["ASUS TUF B660"],
+            "ram": ["16GB DDR4", "8GB DDR4"],
+            "storage": ["512GB SSD"],
+            "graphics_card": ["Integrated Graphics"],  # set_graphics_card(None) also means integrated
+            "power_supply": ["Built-in Battery"],
+            "cooling_system": ["Air Cooling"]
+        }
+    },
+    compatible_motherboards={
+        "Intel Core i9-13900K": ["ASUS ROG Z790", "ASUS TUF B660"],
+        "AMD Ryzen 7 5800X": ["Gigabyte B550"],
+        "Intel Core i5-12400": ["ASUS TUF B660"]
+    }
+)
+
 
 # Abstract Builder: Defines the interface for building computers
 class ComputerBuilder(ABC):
-    def __init__(self, computer_type: str):
+    def __init__(self, computer_type: str, catalog: ComponentCatalog = COMPONENT_CATALOG):
         self.computer = Computer(computer_type)
-        self.component_prices = {
-            "Intel Core i9-13900K": 600.00,
-            "AMD Ryzen 7 5800X": 350.00,
-            "Intel Core i5-12400": 200.00,
-            "ASUS ROG Z790": 400.00,
-            "Gigabyte B550": 150.00,
-            "ASUS TUF B660": 180.00,
-            "32GB DDR5": 200.00,
-            "16GB DDR4": 80.00,
-            "8GB DDR4": 40.00,
-            "1TB NVMe SSD": 100.00,
-            "2TB HDD": 60.00,
-            "512GB SSD": 50.00,
-            "NVIDIA RTX 4090": 1500.00,
-            "AMD Radeon RX 6700 XT": 400.00,
-            "850W PSU": 120.00,
-            "650W PSU": 80.00,
-            "Liquid Cooling": 150.00,
-            "Air Cooling": 50.00
-        }
+        # Builders reference the shared catalog instead of copying its tables
+        self.catalog = catalog
+
+    @property
+    def component_prices(self) -> Mapping[str, float]:
+        return self.catalog.component_prices
+
+    def _add_component(self, attribute: str, component: Optional[str]):
+        # catalog.price() inlined: this runs for every step of every build
+        computer = self.computer
+        setattr(computer, attribute, component)
+        component_id = self.catalog.component_ids.get(component)
+        if component_id is not None:
+            computer.price += self.catalog.prices[component_id]
+        return self
 
     @abstractmethod
     def set_cpu(self, cpu: str):
@@ -105,123 +243,125 @@ class ComputerBuilder(ABC):
 
 # Concrete Builder: Desktop Computer Builder
 class DesktopBuilder(ComputerBuilder):
-    def __init__(self):
-        super().__init__("Desktop")
+    def __init__(self, catalog: ComponentCatalog = COMPONENT_CATALOG):
+        super().__init__("Desktop", catalog)
+        self._parts = catalog.allowed_parts["Desktop"]
 
     def set_cpu(self, cpu: str):
-        if cpu not in ["Intel Core i9-13900K", "AMD Ryzen 7 5800X", "Intel Core i5-12400"]:
+        if cpu not in self._parts["cpu"]:
             raise ValueError(f"Unsupported CPU: {cpu}")
-        self.computer.cpu = cpu
-        self.computer.price += self.component_prices.get(cpu, 0)
-        return self
+        return self._add_component("cpu", cpu)
 
     def set_motherboard(self, motherboard: str):
-        compatible_motherboards = {
-            "Intel Core i9-13900K": ["ASUS ROG Z790", "ASUS TUF B660"],
-            "AMD Ryzen 7 5800X": ["Gigabyte B550"],
-            "Intel Core i5-12400": ["ASUS TUF B660"]
-        }
         cpu = self.computer.cpu
-        if cpu and motherboard not in compatible_motherboards.get(cpu, []):
+        if cpu and motherboard not in self.catalog.compatible_motherboards.get(cpu, ()):
             raise ValueError(f"Motherboard {motherboard} is not compatible with CPU {cpu}")
-        self.computer.motherboard = motherboard
-        self.computer.price += self.component_prices.get(motherboard, 0)
-        return self
+        return self._add_component("motherboard", motherboard)
 
     def set_ram(self, ram: str):
-        if ram not in ["32GB DDR5", "16GB DDR4", "8GB DDR4"]:
+        if ram not in self._parts["ram"]:
             raise ValueError(f"Unsupported RAM: {ram}")
-        self.computer.ram = ram
-        self.computer.price += self.component_prices.get(ram, 0)
-        return self
+        return self._add_component("ram", ram)
 
     def set_storage(self, storage: str):
-        if storage not in ["1TB NVMe SSD", "2TB HDD", "512GB SSD"]:
+        if storage not in self._parts["storage"]:
             raise ValueError(f"Unsupported storage: {storage}")
-        self.computer.storage = storage
-        self.computer.price += self.component_prices.get(storage, 0)
-        return self
+        return self._add_component("storage", storage)
 
     def set_graphics_card(self, graphics_card: Optional[str]):
-        if graphics_card and graphics_card not in ["NVIDIA RTX 4090", "AMD Radeon RX 6700 XT"]:
+        if graphics_card and graphics_card not in self._parts["graphics_card"]:
             raise ValueError(f"Unsupported graphics card: {graphics_card}")
-        self.computer.graphics_card = graphics_card
-        if graphics_card:
-            self.computer.price += self.component_prices.get(graphics_card, 0)
-        return self
+        return self._add_component("graphics_card", graphics_card)
 
     def set_power_supply(self, power_supply: str):
-        if power_supply not in ["850W PSU", "650W PSU"]:
+        if power_supply not in self._parts["power_supply"]:
             raise ValueError(f"Unsupported power supply: {power_supply}")
-        self.computer.power_supply = power_supply
-        self.computer.price += self.component_prices.get(power_supply, 0)
-        return self
+        return self._add_component("power_supply", power_supply)
 
     def set_cooling_system(self, cooling_system: str):
-        if cooling_system not in ["Liquid Cooling", "Air Cooling"]:
+        if cooling_system not in self._parts["cooling_system"]:
             raise ValueError(f"Unsupported cooling system: {cooling_system}")
-        self.computer.cooling_system = cooling_system
-        self.computer.price += self.component_prices.get(cooling_system, 0)
-        return self
+        return self._add_component("cooling_system", cooling_system)
 
 
 # Concrete Builder: Laptop Computer Builder
 class LaptopBuilder(ComputerBuilder):
-    def __init__(self):
-        super().__init__("Laptop")
+    def __init__(self, catalog: ComponentCatalog = COMPONENT_CATALOG):
+        super().__init__("Laptop", catalog)
+        self._parts = catalog.allowed_parts["Laptop"]
 
     def set_cpu(self, cpu: str):
-        if cpu not in ["Intel Core i5-12400"]:
+        if cpu not in self._parts["cpu"]:
             raise ValueError(f"Unsupported CPU for laptop: {cpu}")
-        self.computer.cpu = cpu
-        self.computer.price += self.component_prices.get(cpu, 0)
-        return self
+        return self._add_component("cpu", cpu)
 
     def set_motherboard(self, motherboard: str):
-        if motherboard != "ASUS TUF B660":
+        if motherboard not in self._parts["motherboard"]:
             raise ValueError(f"Unsupported motherboard for laptop: {motherboard}")
-        self.computer.motherboard = motherboard
-        self.computer.price += self.component_prices.get(motherboard, 0)
-        return self
+        return self._add_component("motherboard", motherboard)
 
     def set_ram(self, ram: str):
-        if ram not in ["16GB DDR4", "8GB DDR4"]:
+        if ram not in self._parts["ram"]:
             raise ValueError(f"Unsupported RAM for laptop: {ram}")
-        self.computer.ram = ram
-        self.computer.price += self.component_prices.get(ram, 0)
-        return self
+        return self._add_component("ram", ram)
 
     def set_storage(self, storage: str):
-        if storage not in ["512GB SSD"]:
+        if storage not in self._parts["storage"]:
             raise ValueError(f"Unsupported storage for laptop: {storage}")
-        self.computer.storage = storage
-        self.computer.price += self.component_prices.get(storage, 0)
-        return self
+        return self._add_component("storage", storage)
 
     def set_graphics_card(self, graphics_card: Optional[str]):
         # Laptops typically have integrated graphics
-        self.computer.graphics_card = graphics_card or "Integrated Graphics"
-        if graphics_card and graphics_card != "Integrated Graphics":
+        if graphics_card and graphics_card not in self._parts["graphics_card"]:
             raise ValueError("Laptops only support integrated graphics")
-        return self
+        return self._add_component("graphics_card", graphics_card or "Integrated Graphics")
 
     def set_power_supply(self, power_supply: str):
-        if power_supply != "Built-in Battery":
+        if power_supply not in self._parts["power_supply"]:
             raise ValueError(f"Unsupported power supply for laptop: {power_supply}")
-        self.computer.power_supply = power_supply
-        self.computer.price += 100.00  # Fixed cost for built-in battery
-        return self
+        # Built-in battery is priced through the catalog ($100 fixed cost)
+        return self._add_component("power_supply", power_supply)
 
     def set_cooling_system(self, cooling_system: str):
-        if cooling_system != "Air Cooling":
+        if cooling_system not in self._parts["cooling_system"]:
             raise ValueError(f"Unsupported cooling system for laptop: {cooling_system}")
-        self.computer.cooling_system = cooling_system
-        self.computer.price += self.component_prices.get(cooling_system, 0)
-        return self
+        return self._add_component("cooling_system", cooling_system)
+
+
+# Builder steps in the order the director applies them, keyed by Computer attribute
+BUILD_STEPS = (
+    ("cpu", "set_cpu"),
+    ("motherboard", "set_motherboard"),
+    ("ram", "set_ram"),
+    ("storage", "set_storage"),
+    ("graphics_card", "set_graphics_card"),
+    ("power_supply", "set_power_supply"),
+    ("cooling_system", "set_cooling_system")
+)
 
 
 # Director: Provides predefined configurations
 class ComputerDirector:
+    @staticmethod
+    def build_from_spec(spec: Dict, catalog: ComponentCatalog = COMPONENT_CATALOG) -> Computer:
+        # Specs come from requests and files; a malformed one is a ValueError like any other bad spec
+        if not isinstance(spec, dict):
+            raise ValueError(f"Computer spec must be an object: {spec!r}")
+        for component, _ in BUILD_STEPS:
+            part = spec.get(component)
+            if part is not None and not isinstance(part, str):
+                raise ValueError(f"{component} must be a part name: {part!r}")
+        computer_type = str(spec.get("computer_type", "")).lower()
+        if computer_type == "desktop":
+            builder = DesktopBuilder(catalog)
+        elif computer_type == "laptop":
+            builder = LaptopBuilder(catalog)
+        else:
+            raise ValueError(f"Unknown computer type: {spec.get('computer_type')}")
+        for component, step in BUILD_STEPS:
+            getattr(builder, step)(spec.get(component))
+        return builder.build()
+
     @staticmethod
     def build_high_end_desktop(builder: ComputerBuilder):
         return (builder
@@ -258,6 +398,23 @@ class ComputerDirector:
                 .set_cooling_system("Air Cooling")
                 .build())
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def preset(name: str) -> FrozenComputer:
+        """Build a named preset once and share the frozen result; call copy() on it to customize."""
+        if name not in PRESETS:
+            raise ValueError(f"Unknown preset: {name}")
+        builder_class, build = PRESETS[name]
+        return build(builder_class()).freeze()
+
+
+# Presets available through ComputerDirector.preset, as (builder class, director method)
+PRESETS = {
+    "high_end_desktop": (DesktopBuilder, ComputerDirector.build_high_end_desktop),
+    "budget_desktop": (DesktopBuilder, ComputerDirector.build_budget_desktop),
+    "standard_laptop": (LaptopBuilder, ComputerDirector.build_standard_laptop)
+}
+
 
 # Client code: Interactive CLI for building computers
 def interactive_builder():
@@ -0,0 +1,219 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+from builder_computer import ComputerDirector
+from meal_plan_optimizer import MealPlanOptimizer
+from meal_planner_builder import PLAN_BUILDERS, MealPlanDirector
+
+# Catalogs are loaded at import; the optimizer's per-preference index is shared by every request
+OPTIMIZER = MealPlanOptimizer()
+
+
+def handle_request(request: Dict) -> Dict:
+    """Answer one build request.
+
+    Request types:
+      {"type": "computer", "spec": {...Computer.to_dict() fields...}}
+      {"type": "computer_preset", "name": "high_end_desktop"}
+      {"type": "meal_plan", "spec": {...MealPlan.to_dict() fields...}}
+      {"type": "meal_plan_optimize", "plan_type": "premium", "dietary_preference": "vegan",
+       "calorie_target": 2000, "macro_ratio": {...}, "top_k": 3}
+    """
+    request_type = request.get("type")
+    try:
+        if request_type in ("computer", "meal_plan") and not isinstance(request.get("spec") or {}, dict):
+            raise ValueError(f"spec must be a JSON object: {request.get('spec')!r}")
+        if request_type == "computer":
+            result = ComputerDirector.build_from_spec(request.get("spec") or {}).to_dict()
+        elif request_type == "computer_preset":
+            result = ComputerDirector.preset(request.get("name")).to_dict()
+        elif request_type == "meal_plan":
+            result = MealPlanDirector.build_from_spec(request.get("spec") or {}).to_dict()
+        elif request_type == "meal_plan_optimize":
+            plan_type = str(request.get("plan_type", "standard")).lower()
+            if plan_type not in PLAN_BUILDERS:
+                raise ValueError(f"Unknown plan type: {request.get('plan_type')}")
+            plans = OPTIMIZER.optimize(request.get("dietary_preference") or "none", request.get("calorie_target", 0),
+                                       request.get("macro_ratio"), builder_class=PLAN_BUILDERS[plan_type],
+                                       top_k=request.get("top_k", 1))
+            result = [plan.to_dict() for plan in plans]
+        else:
+            raise ValueError(f"Unknown request type: {request_type}")
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        # A malformed request fails on its own; it must not take down serve_stdin or the HTTP connection
+        return {"id": request.get("id"), "ok": False, "error": str(e)}
+    return {"id": request.get("id"), "ok": True, "result": result}
+
+
+def handle_line(line: bytes) -> Dict:
+    try:
+        request = json.loads(line)
+    except ValueError as e:
+        return {"id": None, "ok": False, "error": f"Invalid JSON: {e}"}
+    if not isinstance(request, dict):
+        return {"id": None, "ok": False, "error": "Request must be a JSON object"}
+    return handle_request(request)
+
+
+# Service mode 1: one JSON request per stdin line, one JSON response per stdout line
+def serve_stdin():
+    for line in sys.stdin.buffer:
+        if line.strip():
+            sys.stdout.write(json.dumps(handle_line(line)) + "\n")
+            sys.stdout.flush()
+
+
+# Service mode 2: small HTTP/1.1 server on asyncio; POST /build with a request body, keep-alive supported
+async def _handle_http(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            method, path, _ = request_line.decode("latin-1").split(" ", 2)
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+            if method == "POST" and path == "/build":
+                # Building is CPU-bound; run it off the event loop so other connections keep being served
+                try:
+                    status, payload = "200 OK", await loop.run_in_executor(None, handle_line, body)
+                except Exception as e:
+                    status, payload = "500 Internal Server Error", {"ok": False, "error": f"Internal error: {e!r}"}
+            elif method == "GET" and path == "/health":
+                status, payload = "200 OK", {"ok": True}
+            else:
+                status, payload = "404 Not Found", {"ok": False, "error": f"No route for {method} {path}"}
+            data = json.dumps(payload).encode()
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+            await writer.drain()
+            if headers.get("connection", "").lower() == "close":
+                break
+    except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_http_server(host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+    return await asyncio.start_server(_handle_http, host, port)
+
+
+async def serve_http(host: str, port: int):
+    server = await start_http_server(host, port)
+    print(f"Builder service listening on http://{host}:{port}/build")
+    async with server:
+        await server.serve_forever()
+
+
+# Load test: keep-alive clients hammer POST /build and report throughput and latency percentiles
+SAMPLE_REQUESTS = [
+    {"type": "computer_preset", "name": "high_end_desktop"},
+    {"type": "computer", "spec": {"computer_type": "desktop", "cpu": "AMD Ryzen 7 5800X",
+                                  "motherboard": "Gigabyte B550", "ram": "16GB DDR4", "storage": "2TB HDD",
+                                  "graphics_card": "AMD Radeon RX 6700 XT", "power_supply": "650W PSU",
+                                  "cooling_system": "Air Cooling"}},
+    {"type": "meal_plan", "spec": {"plan_type": "premium", "dietary_preference": "vegan",
+                                   "breakfast": "Vegan Oatmeal", "lunch": "Tofu Stir-Fry",
+                                   "dinner": "Tofu Stir-Fry", "snacks": ["Fruit Salad"]}},
+    {"type": "meal_plan_optimize", "plan_type": "standard", "dietary_preference": "gluten-free",
+     "calorie_target": 2000, "top_k": 3}
+]
+
+
+async def load_test(host: str, port: int, total: int, concurrency: int,
+                    requests: Optional[List[Dict]] = None) -> Dict:
+    requests = requests or SAMPLE_REQUESTS
+    messages = []
+    for request in requests:
+        body = json.dumps(request).encode()
+        messages.append(f"POST /build HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                        f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    latencies: List[float] = []
+    failures = 0
+    remaining = iter(range(total))
+
+    async def client():
+        nonlocal failures
+        reader, writer = await asyncio.open_connection(host, port)
+        for number in remaining:
+            start = time.perf_counter()
+            writer.write(messages[number % len(messages)])
+            await writer.drain()
+            status = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if b" 200 " not in status:
+                failures += 1
+        writer.close()
+        await writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    def percentile(fraction: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000
+
+    return {"requests": len(latencies), "failures": failures, "seconds": round(elapsed, 3),
+            "requests_per_second": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(percentile(0.50), 3), "p99_ms": round(percentile(0.99), 3)}
+
+
+async def _self_load_test(total: int, concurrency: int) -> Dict:
+    # Without a target, run the server in this event loop on a free port and test against it
+    server = await start_http_server("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        return await load_test("127.0.0.1", port, total, concurrency)
+
+
+# Example usage
+if __name__ == "__main__":
+    # Sampled profiling of the hot paths when DESIGNPATTERNS_PROFILE_RATE is set; profiling.py lives in the folder above
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import profiling
+    profiling.install_from_env()
+
+    parser = argparse.ArgumentParser(description="Request/response service for the computer and meal plan builders")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    subcommands.add_parser("stdin", help="read JSON requests from stdin, one per line")
+    http_parser = subcommands.add_parser("http", help="serve POST /build over HTTP")
+    http_parser.add_argument("--host", default="127.0.0.1")
+    http_parser.add_argument("--port", type=int, default=8080)
+    load_parser = subcommands.add_parser("loadtest", help="measure requests/sec and p99 latency")
+    load_parser.add_argument("--host", help="service to test; omit to start one in-process")
+    load_parser.add_argument("--port", type=int, default=8080)
+    load_parser.add_argument("--requests", type=int, default=20000)
+    load_parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.command == "stdin":
+        serve_stdin()
+    elif args.command == "http":
+        asyncio.run(serve_http(args.host, args.port))
+    elif args.host:
+        print(json.dumps(asyncio.run(load_test(args.host, args.port, args.requests, args.concurrency))))
+    else:
+        print(json.dumps(asyncio.run(_self_load_test(args.requests, args.concurrency))))
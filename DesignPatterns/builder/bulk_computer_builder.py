@@ -0,0 +1,74 @@
+import os
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Union
+
+from batching import chunked, map_in_order
+from builder_computer import Computer, ComputerDirector
+
+BuildResult = Union[Computer, ValueError]
+
+
+# Worker: Builds one chunk of specs, reusing the shared component catalog
+def build_chunk(specs: List[Dict]) -> List[BuildResult]:
+    results = []
+    for spec in specs:
+        try:
+            results.append(ComputerDirector.build_from_spec(spec))
+        except ValueError as e:
+            results.append(e)
+    return results
+
+
+# Bulk Builder: Validates and prices many configuration specs per request
+class BulkComputerBuilder:
+    def __init__(self, workers: int = 0, chunk_size: int = 10000):
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive: {chunk_size}")
+        self.workers = workers
+        self.chunk_size = chunk_size
+
+    def build_all(self, specs: Iterable[Dict]) -> Iterator[BuildResult]:
+        """Yield a Computer or the ValueError raised for each spec, in input order."""
+        chunks = ((chunk,) for chunk in chunked(specs, self.chunk_size))
+        for results in map_in_order(build_chunk, chunks, self.workers):
+            yield from results
+
+    def quote(self, specs: Iterable[Dict]) -> List[BuildResult]:
+        return list(self.build_all(specs))
+
+
+# Example usage
+if __name__ == "__main__":
+    # Sampled profiling of the hot paths when DESIGNPATTERNS_PROFILE_RATE is set; profiling.py lives in the folder above
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import profiling
+    profiling.install_from_env()
+
+    sample_specs = [
+        {"computer_type": "desktop", "cpu": "Intel Core i9-13900K", "motherboard": "ASUS ROG Z790",
+         "ram": "32GB DDR5", "storage": "1TB NVMe SSD", "graphics_card": "NVIDIA RTX 4090",
+         "power_supply": "850W PSU", "cooling_system": "Liquid Cooling"},
+        {"computer_type": "desktop", "cpu": "AMD Ryzen 7 5800X", "motherboard": "ASUS ROG Z790",
+         "ram": "16GB DDR4", "storage": "2TB HDD", "graphics_card": None,
+         "power_supply": "650W PSU", "cooling_system": "Air Cooling"},
+        {"computer_type": "laptop", "cpu": "Intel Core i5-12400", "motherboard": "ASUS TUF B660",
+         "ram": "16GB DDR4", "storage": "512GB SSD", "graphics_card": None,
+         "power_supply": "Built-in Battery", "cooling_system": "Air Cooling"}
+    ]
+
+    for result in BulkComputerBuilder().quote(sample_specs):
+        if isinstance(result, ValueError):
+            print(f"Error: {result}")
+        else:
+            print(f"{result.computer_type}: ${result.price:.2f}")
+
+    # Benchmark: price 1M configurations serially and on a process pool
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    for workers in (0, os.cpu_count() or 1):
+        workload = (sample_specs[i % len(sample_specs)] for i in range(count))
+        start = time.perf_counter()
+        errors = sum(isinstance(r, ValueError) for r in BulkComputerBuilder(workers=workers).build_all(workload))
+        elapsed = time.perf_counter() - start
+        print(f"workers={workers}: {count} specs in {elapsed:.2f}s "
+              f"({count / elapsed:,.0f} specs/s, {errors} errors)")
@@ -0,0 +1,160 @@
+import os
+import random
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from batching import chunked, map_in_order
+from meal_plan_optimizer import MealPlanOptimizer
+from meal_planner_builder import NUTRITION_CATALOG, PLAN_BUILDERS, MealPlanDirector
+from record_store import RecordWriter
+
+
+class ChunkReport(NamedTuple):
+    chunk: int
+    users: int
+    plans: int
+    errors: int
+    seconds: float
+
+    def __str__(self):
+        rate = self.plans / self.seconds if self.seconds else 0.0
+        return (f"chunk {self.chunk}: {self.users} users, {self.plans} plans, {self.errors} errors "
+                f"in {self.seconds:.2f}s ({rate:,.0f} plans/s)")
+
+
+# One optimizer per process; its per-preference meal index is built on first use and then reused
+_optimizer: Optional[MealPlanOptimizer] = None
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_record(record: Dict) -> None:
+    # Records come from outside; a wrong type must become an error row, not a TypeError that ends the run
+    MealPlanDirector.check_spec(record)
+    if "calorie_target" not in record:
+        return
+    if not _is_number(record["calorie_target"]):
+        raise ValueError(f"calorie_target must be a number: {record['calorie_target']!r}")
+    days = record.get("days", 7)
+    if not isinstance(days, int) or isinstance(days, bool):
+        raise ValueError(f"days must be an integer: {days!r}")
+    macro_ratio = record.get("macro_ratio")
+    if macro_ratio is not None and not (isinstance(macro_ratio, dict) and all(map(_is_number, macro_ratio.values()))):
+        raise ValueError(f"macro_ratio must map macros to numbers: {macro_ratio!r}")
+
+
+def plans_for_user(record: Dict) -> List[Dict]:
+    """Output rows for one user record.
+
+    A record either names its meals (``breakfast``, ``lunch``, ``dinner``, ``snacks``) or gives a
+    ``calorie_target`` (plus optional ``macro_ratio``), in which case the optimizer proposes one
+    plan per day for ``days`` days (default 7).
+    """
+    global _optimizer
+    if not isinstance(record, dict):
+        return [{"user_id": None, "error": f"User record must be an object: {record!r}"}]
+    user_id = record.get("user_id")
+    try:
+        _check_record(record)
+        if "calorie_target" not in record:
+            return [{"user_id": user_id, "day": 1, "plan": MealPlanDirector.build_from_spec(record).to_dict()}]
+        plan_type = str(record.get("plan_type", "standard")).lower()
+        if plan_type not in PLAN_BUILDERS:
+            raise ValueError(f"Unknown plan type: {record.get('plan_type')}")
+        if _optimizer is None:
+            _optimizer = MealPlanOptimizer(NUTRITION_CATALOG)
+        plans = _optimizer.optimize(record.get("dietary_preference") or "none", record["calorie_target"],
+                                    record.get("macro_ratio"), builder_class=PLAN_BUILDERS[plan_type],
+                                    top_k=record.get("days", 7))
+        if not plans:
+            raise ValueError(f"No compatible meals for {record.get('dietary_preference')} diet")
+        return [{"user_id": user_id, "day": day, "plan": plan.to_dict()} for day, plan in enumerate(plans, 1)]
+    except ValueError as e:
+        return [{"user_id": user_id, "error": str(e)}]
+    except (TypeError, KeyError, AttributeError) as e:
+        # Anything _check_record did not anticipate still only fails this user
+        return [{"user_id": user_id, "error": f"Invalid user record: {e!r}"}]
+
+
+# Worker: Builds the plans for one chunk of users and times itself
+def build_chunk(chunk: int, records: List[Dict]) -> Tuple[List[Dict], ChunkReport]:
+    start = time.perf_counter()
+    rows = []
+    for record in records:
+        rows.extend(plans_for_user(record))
+    errors = sum(1 for row in rows if "error" in row)
+    report = ChunkReport(chunk, len(records), len(rows) - errors, errors, time.perf_counter() - start)
+    return rows, report
+
+
+# Pipeline: Streams user records in and meal plans out as JSON Lines, a bounded number of chunks at a time
+class PopulationMealPlanner:
+    def __init__(self, workers: int = 0, chunk_size: int = 5000, report: bool = True):
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive: {chunk_size}")
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.report = report
+
+    def run(self, records: Iterable[Dict], output_path: str) -> List[ChunkReport]:
+        reports = []
+        with RecordWriter(output_path) as writer:
+            for rows, report in self._results(records):
+                writer.write_many(rows)
+                writer.flush()
+                reports.append(report)
+                if self.report:
+                    print(report)
+        return reports
+
+    def _results(self, records: Iterable[Dict]) -> Iterator[Tuple[List[Dict], ChunkReport]]:
+        # At most two chunks per worker are in flight, so memory stays bounded for any population size
+        return map_in_order(build_chunk, enumerate(chunked(records, self.chunk_size), 1), self.workers)
+
+
+def synthetic_population(user_count: int, seed: int = 0) -> Iterator[Dict]:
+    """Random subscribers: most ask for a calorie target, some pick their meals (not always validly)."""
+    rng = random.Random(seed)
+    meals = NUTRITION_CATALOG.meal_names
+    for user_id in range(user_count):
+        plan_type = rng.choice(("standard", "premium"))
+        preference = rng.choice(("vegan", "keto", "gluten-free", "none"))
+        if rng.random() < 0.8:
+            yield {"user_id": user_id, "plan_type": plan_type, "dietary_preference": preference,
+                   "calorie_target": rng.randrange(1400, 3000, 50)}
+        else:
+            yield {"user_id": user_id, "plan_type": plan_type, "dietary_preference": preference,
+                   "breakfast": rng.choice(meals), "lunch": rng.choice(meals), "dinner": rng.choice(meals),
+                   "snacks": rng.sample(meals, rng.randint(0, 3))}
+
+
+# Example usage
+if __name__ == "__main__":
+    # Sampled profiling of the hot paths when DESIGNPATTERNS_PROFILE_RATE is set; profiling.py lives in the folder above
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import profiling
+    profiling.install_from_env()
+
+    # Only the benchmark below needs these
+    import shutil
+    import tempfile
+
+    user_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    workdir = tempfile.mkdtemp()
+    try:
+        for workers in (0, os.cpu_count() or 1):
+            output_path = os.path.join(workdir, f"plans_{workers}.jsonl")
+            start = time.perf_counter()
+            reports = PopulationMealPlanner(workers=workers, chunk_size=10_000, report=False).run(
+                synthetic_population(user_count), output_path)
+            elapsed = time.perf_counter() - start
+            plans = sum(report.plans for report in reports)
+            errors = sum(report.errors for report in reports)
+            print(f"workers={workers}: {user_count} users -> {plans} plans ({errors} errors) in {elapsed:.2f}s "
+                  f"({plans / elapsed:,.0f} plans/s, {os.path.getsize(output_path) / 1e6:.1f} MB)")
+            print(f"  slowest {max(reports, key=lambda report: report.seconds)}")
+    finally:
+        shutil.rmtree(workdir)
@@ -0,0 +1,178 @@
+import random
+import sys
+import time
+from itertools import product
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from builder_computer import (BUILD_STEPS, COMPONENT_CATALOG, ComponentCatalog, Computer,
+                              ComputerDirector)
+
+CATEGORIES = tuple(component for component, _ in BUILD_STEPS)
+
+# DesktopBuilder checks CPU/motherboard compatibility; LaptopBuilder only restricts the allowed parts
+COMPATIBILITY_CHECKED = {"Desktop": True, "Laptop": False}
+
+# (price in cents, parts) for one choice within a slot
+Option = Tuple[int, Tuple[Optional[str], ...]]
+
+
+# Search: Finds valid configurations in the catalog without chaining a builder per candidate
+class ConfigurationSearch:
+    def __init__(self, computer_type: str = "Desktop", catalog: ComponentCatalog = COMPONENT_CATALOG):
+        if computer_type not in catalog.allowed_parts:
+            raise ValueError(f"Unknown computer type: {computer_type}")
+        self.computer_type = computer_type
+        self.catalog = catalog
+
+    def cheapest(self, required: Optional[Dict[str, str]] = None, limit: int = 1) -> List[Computer]:
+        """Cheapest valid builds containing every part in ``required``, e.g. {"graphics_card": "NVIDIA RTX 4090"}."""
+        return self.search(required, limit=limit, cheapest=True)
+
+    def top_under_budget(self, budget: float, limit: int = 10,
+                         required: Optional[Dict[str, str]] = None) -> List[Computer]:
+        """Most expensive valid builds whose total price does not exceed ``budget``."""
+        return self.search(required, max_price=budget, limit=limit, cheapest=False)
+
+    def search(self, required: Optional[Dict[str, str]] = None, max_price: Optional[float] = None,
+               limit: int = 10, cheapest: bool = True) -> List[Computer]:
+        if limit < 1:
+            raise ValueError(f"limit must be positive: {limit}")
+        slots = self._slots(required or {})
+        if not all(slots):
+            return []
+
+        # reachable[d] has bit t set when the slots from d onward can add up to exactly t cents;
+        # the CPU/motherboard slot goes last so its (large) option list is only turned into a bitset once
+        ceiling = sum(max(price for price, _ in options) for options in slots)
+        if max_price is not None:
+            ceiling = min(ceiling, int(max_price * 100 + 1e-6))
+        if ceiling < 0:
+            return []
+        reachable = [0] * len(slots) + [1]
+        for depth in range(len(slots) - 1, -1, -1):
+            below = reachable[depth + 1]
+            bits = 0
+            for price in {price for price, _ in slots[depth]}:
+                bits |= below << price
+            reachable[depth] = bits & ((1 << (ceiling + 1)) - 1)
+        tables = [bits.to_bytes(ceiling // 8 + 1, "little") for bits in reachable]
+
+        def has(depth: int, total: int) -> bool:
+            return total >= 0 and bool(tables[depth][total >> 3] >> (total & 7) & 1)
+
+        def combinations(depth: int, remaining: int) -> Iterator[Tuple[Optional[str], ...]]:
+            # Every branch taken here is guaranteed to complete, so no work is wasted on dead ends
+            if depth == len(slots):
+                yield ()
+                return
+            for price, parts in slots[depth]:
+                if price > remaining:
+                    break
+                if has(depth + 1, remaining - price):
+                    for rest in combinations(depth + 1, remaining - price):
+                        yield parts + rest
+
+        found = []
+        totals = range(ceiling + 1) if cheapest else range(ceiling, -1, -1)
+        for total in totals:
+            if not has(0, total):
+                continue
+            for parts in combinations(0, total):
+                found.append(self._build(parts))
+                if len(found) == limit:
+                    return found
+        return found
+
+    def _options(self, category: str, required: Optional[str]) -> List[Optional[str]]:
+        allowed = self.catalog.allowed(self.computer_type, category)
+        if required is None:
+            return list(allowed)
+        return [required] if required in allowed else []
+
+    def _slots(self, required: Dict[str, str]) -> List[List[Option]]:
+        def cents(*parts: Optional[str]) -> int:
+            return round(sum(self.catalog.price(part) for part in parts) * 100)
+
+        slots = [[(cents(part), (part,)) for part in self._options(category, required.get(category))]
+                 for category in CATEGORIES[2:]]
+        # The CPU and motherboard share one slot so incompatible pairs are dropped before pricing
+        pairs = []
+        for cpu in self._options("cpu", required.get("cpu")):
+            for board in self._options("motherboard", required.get("motherboard")):
+                if (COMPATIBILITY_CHECKED[self.computer_type]
+                        and board not in self.catalog.compatible_motherboards.get(cpu, ())):
+                    continue
+                pairs.append((cents(cpu, board), (cpu, board)))
+        slots.append(pairs)
+        for options in slots:
+            options.sort(key=lambda option: (option[0], str(option[1])))
+        return slots
+
+    def _build(self, parts: Tuple[Optional[str], ...]) -> Computer:
+        # Slots are ordered ram .. cooling_system, then the CPU/motherboard pair
+        spec = dict(zip(CATEGORIES[2:] + CATEGORIES[:2], parts), computer_type=self.computer_type)
+        return ComputerDirector.build_from_spec(spec, self.catalog)
+
+
+def brute_force_search(computer_type: str, catalog: ComponentCatalog, max_price: float,
+                       limit: int) -> List[Computer]:
+    """Reference implementation: chain a builder for every combination and sort the survivors."""
+    parts = catalog.allowed_parts[computer_type]
+    found = []
+    for combination in product(*(sorted(parts[category], key=str) for category in CATEGORIES)):
+        spec = dict(zip(CATEGORIES, combination), computer_type=computer_type)
+        try:
+            computer = ComputerDirector.build_from_spec(spec, catalog)
+        except ValueError:
+            continue
+        if computer.price <= max_price:
+            found.append(computer)
+    found.sort(key=lambda computer: computer.price, reverse=True)
+    return found[:limit]
+
+
+def synthetic_catalog(parts_per_category: int, seed: int = 0) -> ComponentCatalog:
+    """Desktop-only catalog with random prices and a random CPU/motherboard compatibility matrix."""
+    rng = random.Random(seed)
+    prices = {}
+    allowed = {}
+    for category in CATEGORIES:
+        names = [f"{category}-{i}" for i in range(parts_per_category)]
+        for name in names:
+            prices[name] = round(rng.uniform(20, 1500), 2)
+        allowed[category] = names
+    allowed["graphics_card"] = [None] + allowed["graphics_card"]
+    compatible = {cpu: rng.sample(allowed["motherboard"], max(1, parts_per_category // 3))
+                  for cpu in allowed["cpu"]}
+    return ComponentCatalog(prices, {"Desktop": allowed}, compatible)
+
+
+# Example usage
+if __name__ == "__main__":
+    print("Cheapest desktop with an RTX 4090:")
+    print(ConfigurationSearch("Desktop").cheapest({"graphics_card": "NVIDIA RTX 4090"})[0])
+
+    print("\nTop 3 desktops under $1500:")
+    for computer in ConfigurationSearch("Desktop").top_under_budget(1500, limit=3):
+        print(f"  ${computer.price:.2f}: {computer.cpu}, {computer.graphics_card or 'no GPU'}")
+
+    # Benchmark: pruned search vs. brute-force builder chaining
+    budget = 4000.0
+    small = synthetic_catalog(5)
+    start = time.perf_counter()
+    expected = brute_force_search("Desktop", small, budget, 10)
+    brute_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    found = ConfigurationSearch("Desktop", small).top_under_budget(budget, limit=10)
+    search_elapsed = time.perf_counter() - start
+    assert [c.price for c in found] == [c.price for c in expected]
+    print(f"\n5 parts/category: brute force {brute_elapsed * 1000:.1f} ms, search {search_elapsed * 1000:.1f} ms")
+
+    for size in (int(arg) for arg in sys.argv[1:] or ["100", "300"]):
+        large = synthetic_catalog(size)
+        search = ConfigurationSearch("Desktop", large)
+        start = time.perf_counter()
+        search.cheapest(limit=10)
+        search.top_under_budget(budget, limit=10)
+        print(f"{size} parts/category: cheapest + top-under-budget in "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms")
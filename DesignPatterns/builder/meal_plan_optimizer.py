@@ -0,0 +1,176 @@
+import random
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from heapq import heappush, heappushpop, nsmallest
+from itertools import combinations_with_replacement, count
+from typing import Dict, List, Optional, Tuple, Type
+
+from meal_planner_builder import (NUTRITION_CATALOG, MealPlan, MealPlanBuilder, NutritionCatalog,
+                                  PremiumMealPlanBuilder, StandardMealPlanBuilder)
+
+# Energy per gram of each macro, used to turn grams into a share of the calorie target
+KCAL_PER_GRAM = (4, 4, 9)
+
+# Share of the day's calories each main meal and each snack slot aims for, before normalizing
+MAIN_MEAL_SHARE = 0.85 / 3
+SNACK_SHARE = 0.075
+
+# Snack sets scored on each side of the calorie gap left by a main-meal set
+SNACK_NEIGHBOURS = 6
+
+Vector = Tuple[float, float, float, float]
+
+
+# Optimizer: Picks meals from the catalog that best fit a calorie target and macro ratio
+class MealPlanOptimizer:
+    def __init__(self, catalog: NutritionCatalog = NUTRITION_CATALOG, pool_size: int = 16):
+        self.catalog = catalog
+        self.pool_size = pool_size
+        # preference -> (meal ids sorted by calories, their calories), filled on first use
+        self._compatible_meals: Dict[Optional[str], Tuple[List[int], List[int]]] = {}
+
+    def optimize(self, preference: str, calorie_target: float, macro_ratio: Optional[Dict[str, float]] = None,
+                 builder_class: Type[MealPlanBuilder] = StandardMealPlanBuilder, top_k: int = 5,
+                 max_snacks: Optional[int] = None) -> List[MealPlan]:
+        """Return up to ``top_k`` plans, best first. ``macro_ratio`` is the share of calories per macro."""
+        if calorie_target <= 0:
+            raise ValueError(f"Calorie target must be positive: {calorie_target}")
+        if top_k < 1:
+            raise ValueError(f"top_k must be positive: {top_k}")
+        # The builder validates the preference exactly as a hand-built plan would
+        preference = builder_class(self.catalog).set_dietary_preference(preference).build().dietary_preference
+        if builder_class.MAX_SNACKS is not None:
+            max_snacks = builder_class.MAX_SNACKS if max_snacks is None else min(max_snacks, builder_class.MAX_SNACKS)
+        elif max_snacks is None:
+            max_snacks = 2
+
+        ratio = macro_ratio or {"protein": 0.3, "carbs": 0.4, "fat": 0.3}
+        ratio_total = sum(ratio.get(macro, 0) for macro in NutritionCatalog.MACROS)
+        if ratio_total <= 0:
+            raise ValueError(f"Macro ratio must have a positive share: {macro_ratio}")
+        target = (calorie_target,) + tuple(calorie_target * ratio.get(macro, 0) / ratio_total
+                                          for macro in NutritionCatalog.MACROS)
+
+        scale = 1 / (3 * MAIN_MEAL_SHARE + max_snacks * SNACK_SHARE)
+        mains = self._pool(preference, tuple(value * MAIN_MEAL_SHARE * scale for value in target))
+        if not mains:
+            return []
+        snacks = self._pool(preference, tuple(value * SNACK_SHARE * scale for value in target)) if max_snacks else []
+
+        winners = self._search(target, mains, snacks, max_snacks, top_k)
+        return [self._build(builder_class, preference, meals) for meals in winners]
+
+    def _vector(self, meal_id: int) -> Vector:
+        macros = self.catalog.macros
+        base = meal_id * 3
+        return (self.catalog.calories[meal_id], macros[base] * KCAL_PER_GRAM[0],
+                macros[base + 1] * KCAL_PER_GRAM[1], macros[base + 2] * KCAL_PER_GRAM[2])
+
+    def _compatible(self, preference: Optional[str]) -> Tuple[List[int], List[int]]:
+        cached = self._compatible_meals.get(preference)
+        if cached is None:
+            compatibility = self.catalog.compatibility
+            if preference is None:
+                meal_ids = list(range(len(compatibility)))
+            else:
+                bit = self.catalog.diet_bits.get(preference, 0)
+                meal_ids = [meal_id for meal_id, mask in enumerate(compatibility) if mask & bit]
+            meal_ids.sort(key=self.catalog.calories.__getitem__)
+            cached = (meal_ids, [self.catalog.calories[meal_id] for meal_id in meal_ids])
+            self._compatible_meals[preference] = cached
+        return cached
+
+    def _pool(self, preference: Optional[str], share: Vector) -> List[Tuple[int, Vector]]:
+        """The ``pool_size`` compatible meals closest to ``share``, taken from a calorie window around it."""
+        meal_ids, calories = self._compatible(preference)
+        # Widen the window until it holds enough candidates to choose from
+        wanted = self.pool_size * 10
+        window = 0.05
+        while True:
+            low = bisect_left(calories, share[0] * (1 - window))
+            high = bisect_right(calories, share[0] * (1 + window))
+            if high - low >= wanted or (low == 0 and high == len(meal_ids)):
+                break
+            window *= 2
+        candidates = [(meal_id, self._vector(meal_id)) for meal_id in meal_ids[low:high]]
+        return nsmallest(self.pool_size, candidates,
+                         key=lambda candidate: sum(abs(a - b) for a, b in zip(candidate[1], share)))
+
+    def _search(self, target: Vector, mains: List[Tuple[int, Vector]], snacks: List[Tuple[int, Vector]],
+                max_snacks: int, top_k: int) -> List[Tuple[int, ...]]:
+        # Every multiset of three main meals (order doesn't change the totals)
+        main_sets = [(tuple(meal_id for meal_id, _ in chosen),
+                      tuple(sum(vector[d] for _, vector in chosen) for d in range(4)))
+                     for chosen in combinations_with_replacement(mains, 3)]
+        # Every multiset of up to max_snacks snacks, sorted by calories for the lookup below
+        snack_sets = [((), (0, 0, 0, 0))]
+        for snack_count in range(1, max_snacks + 1):
+            snack_sets.extend((tuple(meal_id for meal_id, _ in chosen),
+                               tuple(sum(vector[d] for _, vector in chosen) for d in range(4)))
+                              for chosen in combinations_with_replacement(snacks, snack_count))
+        snack_sets.sort(key=lambda snack_set: snack_set[1][0])
+        snack_calories = [vector[0] for _, vector in snack_sets]
+
+        # For each main-meal set only the snack sets closest to the remaining calories are scored;
+        # the score is the L1 distance between the plan's (kcal, protein, carbs, fat kcal) and the target
+        t0, t1, t2, t3 = target
+        best = []
+        tiebreak = count()
+        for main_ids, (m0, m1, m2, m3) in main_sets:
+            position = bisect_left(snack_calories, t0 - m0)
+            for snack_ids, (s0, s1, s2, s3) in snack_sets[max(0, position - SNACK_NEIGHBOURS):
+                                                          position + SNACK_NEIGHBOURS]:
+                score = abs(t0 - m0 - s0) + abs(t1 - m1 - s1) + abs(t2 - m2 - s2) + abs(t3 - m3 - s3)
+                entry = (-score, next(tiebreak), main_ids + snack_ids)
+                if len(best) < top_k:
+                    heappush(best, entry)
+                elif score < -best[0][0]:
+                    heappushpop(best, entry)
+        return [chosen for _, _, chosen in sorted(best, reverse=True)]
+
+    def _build(self, builder_class: Type[MealPlanBuilder], preference: Optional[str],
+               meals: Tuple[int, ...]) -> MealPlan:
+        names = self.catalog.meal_names
+        builder = builder_class(self.catalog).set_dietary_preference(preference or "none")
+        # Main meals come back as an unordered set; the lightest one is served as breakfast
+        breakfast, lunch, dinner = (names[meal_id] for meal_id in sorted(meals[:3], key=self.catalog.calories.__getitem__))
+        builder.set_breakfast(breakfast).set_lunch(lunch).set_dinner(dinner)
+        for meal_id in meals[3:]:
+            builder.add_snack(names[meal_id])
+        return builder.build()
+
+
+def synthetic_nutrition_catalog(meal_count: int, seed: int = 0) -> NutritionCatalog:
+    """Catalog of ``meal_count`` random meals, each compatible with a random subset of diets."""
+    rng = random.Random(seed)
+    meal_data = {}
+    compatibility = {"vegan": [], "keto": [], "gluten-free": []}
+    for i in range(meal_count):
+        name = f"Meal {i}"
+        meal_data[name] = {"calories": rng.randint(80, 900),
+                           "macros": {"protein": rng.randint(0, 60), "carbs": rng.randint(0, 110),
+                                      "fat": rng.randint(0, 50)}}
+        for preference, meals in compatibility.items():
+            if rng.random() < 0.4:
+                meals.append(name)
+    return NutritionCatalog(meal_data, compatibility)
+
+
+# Example usage
+if __name__ == "__main__":
+    optimizer = MealPlanOptimizer()
+    print("Best gluten-free premium plan for 1800 kcal:")
+    print(optimizer.optimize("gluten-free", 1800, builder_class=PremiumMealPlanBuilder, top_k=1)[0])
+
+    # Benchmark: top-5 plans from large synthetic catalogs
+    for size in (int(arg) for arg in sys.argv[1:] or ["10000", "50000"]):
+        optimizer = MealPlanOptimizer(synthetic_nutrition_catalog(size))
+        optimizer.optimize("vegan", 2000)  # warm the per-preference index
+        start = time.perf_counter()
+        runs = 20
+        for target in range(runs):
+            plans = optimizer.optimize("vegan", 1500 + target * 50, {"protein": 0.3, "carbs": 0.4, "fat": 0.3},
+                                       builder_class=PremiumMealPlanBuilder)
+        elapsed = (time.perf_counter() - start) / runs
+        print(f"{size} meals: {elapsed * 1000:.1f} ms per top-5 query, best {plans[0].total_calories} kcal")
@@ -1,6 +1,8 @@
 import json
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, List
+from array import array
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Optional, List, Tuple
 
 # Product: The complex object to be built
 class MealPlan:
@@ -37,25 +39,106 @@ class MealPlan:
             "macros": self.macros
         }
 
+    @staticmethod
+    def from_dict(data: Dict) -> "MealPlan":
+        meal_plan = MealPlan(data["plan_type"])
+        meal_plan.dietary_preference = data.get("dietary_preference")
+        meal_plan.breakfast = data.get("breakfast")
+        meal_plan.lunch = data.get("lunch")
+        meal_plan.dinner = data.get("dinner")
+        meal_plan.snacks = list(data.get("snacks", []))
+        meal_plan.total_calories = data.get("total_calories", 0)
+        meal_plan.macros = dict(data.get("macros", meal_plan.macros))
+        return meal_plan
+
+    def copy(self) -> "MealPlan":
+        clone = MealPlan(self.plan_type)
+        clone.dietary_preference = self.dietary_preference
+        clone.breakfast = self.breakfast
+        clone.lunch = self.lunch
+        clone.dinner = self.dinner
+        clone.snacks = list(self.snacks)
+        clone.total_calories = self.total_calories
+        clone.macros = dict(self.macros)
+        return clone
+
+    def diff(self, other: "MealPlan") -> Dict[str, Tuple[Any, Any]]:
+        """Fields that differ, as {field: (value in self, value in other)}."""
+        mine = self.to_dict()
+        theirs = other.to_dict()
+        return {field: (value, theirs[field]) for field, value in mine.items() if theirs[field] != value}
+
+# One builder edit: (field, snack index or None, old value, new value)
+Edit = Tuple[str, Optional[int], Optional[str], Optional[str]]
+
+
+# Catalog: Shared, read-only nutrition data loaded once for every builder
+class NutritionCatalog:
+    MACROS = ("protein", "carbs", "fat")
+
+    def __init__(self, meal_data: Mapping[str, Dict], dietary_compatibility: Mapping[str, Iterable[str]]):
+        # Each meal gets an integer id; calories and macros (in MACROS order) live in packed arrays
+        self.meal_names = tuple(meal_data)
+        self.meal_ids = MappingProxyType({name: i for i, name in enumerate(self.meal_names)})
+        self.calories = array("q", (meal_data[name]["calories"] for name in self.meal_names))
+        self.macros = array("q", (meal_data[name]["macros"][macro]
+                                  for name in self.meal_names for macro in self.MACROS))
+        self.meal_data = MappingProxyType(dict(meal_data))
+        self.dietary_compatibility = MappingProxyType(
+            {preference: tuple(meals) for preference, meals in dietary_compatibility.items()}
+        )
+        # One bit per dietary preference; each meal stores the mask of preferences it satisfies
+        self.diet_bits = MappingProxyType({preference: 1 << i for i, preference in enumerate(dietary_compatibility)})
+        compatibility = [0] * len(self.meal_names)
+        for preference, meals in self.dietary_compatibility.items():
+            bit = self.diet_bits[preference]
+            for meal in meals:
+                if meal in self.meal_ids:
+                    compatibility[self.meal_ids[meal]] |= bit
+        self.compatibility = array("Q", compatibility)
+
+    def is_compatible(self, meal_id: int, preference: str) -> bool:
+        return bool(self.compatibility[meal_id] & self.diet_bits.get(preference, 0))
+
+
+NUTRITION_CATALOG = NutritionCatalog(
+    meal_data={
+        "Vegan Oatmeal": {"calories": 300, "macros": {"protein": 8, "carbs": 50, "fat": 6}},
+        "Grilled Chicken Salad": {"calories": 400, "macros": {"protein": 30, "carbs": 20, "fat": 15}},
+        "Salmon with Quinoa": {"calories": 500, "macros": {"protein": 35, "carbs": 40, "fat": 20}},
+        "Tofu Stir-Fry": {"calories": 350, "macros": {"protein": 15, "carbs": 30, "fat": 10}},
+        "Keto Avocado Bowl": {"calories": 450, "macros": {"protein": 10, "carbs": 5, "fat": 40}},
+        "Fruit Salad": {"calories": 150, "macros": {"protein": 2, "carbs": 35, "fat": 1}},
+        "Nuts": {"calories": 200, "macros": {"protein": 5, "carbs": 10, "fat": 15}},
+        "Protein Bar": {"calories": 250, "macros": {"protein": 20, "carbs": 15, "fat": 10}}
+    },
+    dietary_compatibility={
+        "vegan": ["Vegan Oatmeal", "Tofu Stir-Fry", "Fruit Salad"],
+        "keto": ["Keto Avocado Bowl", "Nuts"],
+        "gluten-free": ["Vegan Oatmeal", "Grilled Chicken Salad", "Salmon with Quinoa", "Tofu Stir-Fry", "Keto Avocado Bowl", "Fruit Salad", "Nuts"]
+    }
+)
+
 # Abstract Builder: Defines the interface for building meal plans
 class MealPlanBuilder(ABC):
-    def __init__(self, plan_type: str):
+    # Maximum number of snacks per plan; None means unlimited
+    MAX_SNACKS: Optional[int] = None
+
+    def __init__(self, plan_type: str, catalog: NutritionCatalog = NUTRITION_CATALOG):
         self.meal_plan = MealPlan(plan_type)
-        self.meal_data = {
-            "Vegan Oatmeal": {"calories": 300, "macros": {"protein": 8, "carbs": 50, "fat": 6}},
-            "Grilled Chicken Salad": {"calories": 400, "macros": {"protein": 30, "carbs": 20, "fat": 15}},
-            "Salmon with Quinoa": {"calories": 500, "macros": {"protein": 35, "carbs": 40, "fat": 20}},
-            "Tofu Stir-Fry": {"calories": 350, "macros": {"protein": 15, "carbs": 30, "fat": 10}},
-            "Keto Avocado Bowl": {"calories": 450, "macros": {"protein": 10, "carbs": 5, "fat": 40}},
-            "Fruit Salad": {"calories": 150, "macros": {"protein": 2, "carbs": 35, "fat": 1}},
-            "Nuts": {"calories": 200, "macros": {"protein": 5, "carbs": 10, "fat": 15}},
-            "Protein Bar": {"calories": 250, "macros": {"protein": 20, "carbs": 15, "fat": 10}}
-        }
-        self.dietary_compatibility = {
-            "vegan": ["Vegan Oatmeal", "Tofu Stir-Fry", "Fruit Salad"],
-            "keto": ["Keto Avocado Bowl", "Nuts"],
-            "gluten-free": ["Vegan Oatmeal", "Grilled Chicken Salad", "Salmon with Quinoa", "Tofu Stir-Fry", "Keto Avocado Bowl", "Fruit Salad", "Nuts"]
-        }
+        # Builders reference the shared catalog instead of copying its tables
+        self.catalog = catalog
+        # Applied edits, newest last; undo() moves them onto the redo stack
+        self._undo_stack: List[Edit] = []
+        self._redo_stack: List[Edit] = []
+
+    @property
+    def meal_data(self) -> Mapping[str, Dict]:
+        return self.catalog.meal_data
+
+    @property
+    def dietary_compatibility(self) -> Mapping[str, tuple]:
+        return self.catalog.dietary_compatibility
 
     @abstractmethod
     def set_dietary_preference(self, preference: str):
@@ -85,106 +168,172 @@ class MealPlanBuilder(ABC):
             json.dump(self.meal_plan.to_dict(), f, indent=4)
         print(f"Meal plan saved to {filename}")
 
-    def _update_nutrition(self, meal: str):
-        if meal in self.meal_data:
-            self.meal_plan.total_calories += self.meal_data[meal]["calories"]
-            for macro, value in self.meal_data[meal]["macros"].items():
-                self.meal_plan.macros[macro] += value
+    def remove_snack(self, snack: str):
+        if snack not in self.meal_plan.snacks:
+            raise ValueError(f"Snack not in plan: {snack}")
+        return self._edit("snacks", self.meal_plan.snacks.index(snack), snack, None)
+
+    def undo(self):
+        if not self._undo_stack:
+            raise ValueError("Nothing to undo")
+        field, index, old, new = self._undo_stack.pop()
+        self._apply(field, index, new, old)
+        self._redo_stack.append((field, index, old, new))
+        return self
+
+    def redo(self):
+        if not self._redo_stack:
+            raise ValueError("Nothing to redo")
+        edit = self._redo_stack.pop()
+        self._apply(*edit)
+        self._undo_stack.append(edit)
+        return self
+
+    def _edit(self, field: str, index: Optional[int], old: Optional[str], new: Optional[str]):
+        self._apply(field, index, old, new)
+        self._undo_stack.append((field, index, old, new))
+        self._redo_stack.clear()
+        return self
+
+    def _apply(self, field: str, index: Optional[int], old: Optional[str], new: Optional[str]):
+        """Swap ``old`` for ``new`` in one field, adjusting totals by the difference only."""
+        if field == "snacks":
+            if old is not None:
+                del self.meal_plan.snacks[index]
+            if new is not None:
+                self.meal_plan.snacks.insert(index, new)
+        else:
+            setattr(self.meal_plan, field, new)
+        if field != "dietary_preference":
+            if old is not None:
+                self._update_nutrition(old, -1)
+            if new is not None:
+                self._update_nutrition(new)
+
+    def _update_nutrition(self, meal: str, sign: int = 1):
+        catalog = self.catalog
+        meal_id = catalog.meal_ids.get(meal)
+        if meal_id is not None:
+            macros = self.meal_plan.macros
+            base = meal_id * 3
+            self.meal_plan.total_calories += sign * catalog.calories[meal_id]
+            macros["protein"] += sign * catalog.macros[base]
+            macros["carbs"] += sign * catalog.macros[base + 1]
+            macros["fat"] += sign * catalog.macros[base + 2]
 
     def _check_dietary_compatibility(self, meal: str, preference: str):
-        if preference and meal not in self.dietary_compatibility.get(preference, []):
+        if preference and not self.catalog.is_compatible(self.catalog.meal_ids[meal], preference):
             raise ValueError(f"{meal} is not compatible with {preference} diet")
 
 # Concrete Builder: Standard Meal Plan Builder
 class StandardMealPlanBuilder(MealPlanBuilder):
-    def __init__(self):
-        super().__init__("Standard")
+    def __init__(self, catalog: NutritionCatalog = NUTRITION_CATALOG):
+        super().__init__("Standard", catalog)
 
     def set_dietary_preference(self, preference: str):
         if preference not in ["vegan", "keto", "gluten-free", "none"]:
             raise ValueError(f"Unsupported dietary preference: {preference}")
-        self.meal_plan.dietary_preference = preference if preference != "none" else None
-        return self
+        return self._edit("dietary_preference", None, self.meal_plan.dietary_preference,
+                          preference if preference != "none" else None)
 
     def set_breakfast(self, breakfast: str):
-        if breakfast not in self.meal_data:
+        if breakfast not in self.catalog.meal_ids:
             raise ValueError(f"Unsupported breakfast: {breakfast}")
         self._check_dietary_compatibility(breakfast, self.meal_plan.dietary_preference)
-        self.meal_plan.breakfast = breakfast
-        self._update_nutrition(breakfast)
-        return self
+        return self._edit("breakfast", None, self.meal_plan.breakfast, breakfast)
 
     def set_lunch(self, lunch: str):
-        if lunch not in self.meal_data:
+        if lunch not in self.catalog.meal_ids:
             raise ValueError(f"Unsupported lunch: {lunch}")
         self._check_dietary_compatibility(lunch, self.meal_plan.dietary_preference)
-        self.meal_plan.lunch = lunch
-        self._update_nutrition(lunch)
-        return self
+        return self._edit("lunch", None, self.meal_plan.lunch, lunch)
 
     def set_dinner(self, dinner: str):
-        if dinner not in self.meal_data:
+        if dinner not in self.catalog.meal_ids:
             raise ValueError(f"Unsupported dinner: {dinner}")
         self._check_dietary_compatibility(dinner, self.meal_plan.dietary_preference)
-        self.meal_plan.dinner = dinner
-        self._update_nutrition(dinner)
-        return self
+        return self._edit("dinner", None, self.meal_plan.dinner, dinner)
 
     def add_snack(self, snack: str):
-        if snack not in self.meal_data:
+        if snack not in self.catalog.meal_ids:
             raise ValueError(f"Unsupported snack: {snack}")
         self._check_dietary_compatibility(snack, self.meal_plan.dietary_preference)
-        self.meal_plan.snacks.append(snack)
-        self._update_nutrition(snack)
-        return self
+        return self._edit("snacks", len(self.meal_plan.snacks), None, snack)
 
 # Concrete Builder: Premium Meal Plan Builder
 class PremiumMealPlanBuilder(MealPlanBuilder):
-    def __init__(self):
-        super().__init__("Premium")
+    MAX_SNACKS = 2
+
+    def __init__(self, catalog: NutritionCatalog = NUTRITION_CATALOG):
+        super().__init__("Premium", catalog)
 
     def set_dietary_preference(self, preference: str):
         if preference not in ["vegan", "keto", "gluten-free"]:
             raise ValueError(f"Premium plans require a specific dietary preference: {preference}")
-        self.meal_plan.dietary_preference = preference
-        return self
+        return self._edit("dietary_preference", None, self.meal_plan.dietary_preference, preference)
 
     def set_breakfast(self, breakfast: str):
-        if breakfast not in self.meal_data:
+        if breakfast not in self.catalog.meal_ids:
             raise ValueError(f"Unsupported breakfast: {breakfast}")
         self._check_dietary_compatibility(breakfast, self.meal_plan.dietary_preference)
-        self.meal_plan.breakfast = breakfast
-        self._update_nutrition(breakfast)
-        return self
+        return self._edit("breakfast", None, self.meal_plan.breakfast, breakfast)
 
     def set_lunch(self, lunch: str):
-        if lunch not in self.meal_data:
+        if lunch not in self.catalog.meal_ids:
             raise ValueError(f"Unsupported lunch: {lunch}")
         self._check_dietary_compatibility(lunch, self.meal_plan.dietary_preference)
-        self.meal_plan.lunch = lunch
-        self._update_nutrition(lunch)
-        return self
+        return self._edit("lunch", None, self.meal_plan.lunch, lunch)
 
     def set_dinner(self, dinner: str):
-        if dinner not in self.meal_data:
+        if dinner not in self.catalog.meal_ids:
             raise ValueError(f"Unsupported dinner: {dinner}")
         self._check_dietary_compatibility(dinner, self.meal_plan.dietary_preference)
-        self.meal_plan.dinner = dinner
-        self._update_nutrition(dinner)
-        return self
+        return self._edit("dinner", None, self.meal_plan.dinner, dinner)
 
     def add_snack(self, snack: str):
-        if len(self.meal_plan.snacks) >= 2:
-            raise ValueError("Premium plan allows a maximum of 2 snacks")
-        if snack not in self.meal_data:
+        if len(self.meal_plan.snacks) >= self.MAX_SNACKS:
+            raise ValueError(f"Premium plan allows a maximum of {self.MAX_SNACKS} snacks")
+        if snack not in self.catalog.meal_ids:
             raise ValueError(f"Unsupported snack: {snack}")
         self._check_dietary_compatibility(snack, self.meal_plan.dietary_preference)
-        self.meal_plan.snacks.append(snack)
-        self._update_nutrition(snack)
-        return self
+        return self._edit("snacks", len(self.meal_plan.snacks), None, snack)
+
+# Builder class for each plan type accepted in a spec
+PLAN_BUILDERS = {
+    "standard": StandardMealPlanBuilder,
+    "premium": PremiumMealPlanBuilder
+}
 
 # Director: Provides predefined meal plans
 class MealPlanDirector:
+    @staticmethod
+    def check_spec(spec: Dict) -> None:
+        """Raise ValueError unless the spec is an object with string fields and a list of string snacks."""
+        # Specs come from requests and files; a wrong type must not surface as "Unsupported snack: N"
+        if not isinstance(spec, dict):
+            raise ValueError(f"Meal plan spec must be an object: {spec!r}")
+        for field in ("plan_type", "dietary_preference", "breakfast", "lunch", "dinner"):
+            if spec.get(field) is not None and not isinstance(spec[field], str):
+                raise ValueError(f"{field} must be a string: {spec[field]!r}")
+        snacks = spec.get("snacks", [])
+        if not isinstance(snacks, list) or not all(isinstance(snack, str) for snack in snacks):
+            raise ValueError(f"snacks must be a list of strings: {snacks!r}")
+
+    @staticmethod
+    def build_from_spec(spec: Dict, catalog: NutritionCatalog = NUTRITION_CATALOG) -> MealPlan:
+        MealPlanDirector.check_spec(spec)
+        plan_type = str(spec.get("plan_type", "standard")).lower()
+        if plan_type not in PLAN_BUILDERS:
+            raise ValueError(f"Unknown plan type: {spec.get('plan_type')}")
+        builder = (PLAN_BUILDERS[plan_type](catalog)
+                   .set_dietary_preference(spec.get("dietary_preference") or "none")
+                   .set_breakfast(spec.get("breakfast"))
+                   .set_lunch(spec.get("lunch"))
+                   .set_dinner(spec.get("dinner")))
+        for snack in spec.get("snacks", []):
+            builder.add_snack(snack)
+        return builder.build()
+
     @staticmethod
     def build_vegan_plan(builder: MealPlanBuilder):
         return (builder
@@ -0,0 +1,260 @@
+import gzip
+import io
+import json
+import mmap
+import os
+import sys
+import time
+from array import array
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+from builder_computer import Computer, ComputerDirector
+from meal_planner_builder import MealPlan, MealPlanDirector, StandardMealPlanBuilder
+
+# Sidecar file holding the byte offset of every record, as little-endian unsigned 64-bit ints
+INDEX_SUFFIX = ".idx"
+
+
+def _as_dict(record) -> Dict:
+    return record if isinstance(record, dict) else record.to_dict()
+
+
+def _scan_offsets(data, position: int = 0, offsets: Optional[array] = None) -> array:
+    """Append the start of every line from ``position`` on to ``offsets``."""
+    offsets = array("Q") if offsets is None else offsets
+    size = len(data)
+    while position < size:
+        offsets.append(position)
+        end = data.find(b"\n", position)
+        if end == -1:
+            break
+        position = end + 1
+    return offsets
+
+
+def _read_index(index_path: str) -> array:
+    offsets = array("Q")
+    with open(index_path, "rb") as f:
+        raw = f.read()
+    offsets.frombytes(raw[:len(raw) - len(raw) % offsets.itemsize])  # drop a half-written entry
+    return offsets
+
+
+def _checked_offsets(data, offsets: array) -> array:
+    """Return ``offsets`` if they cover ``data`` exactly, extended or rebuilt from the data if not.
+
+    An index can be short (records appended after the last flush, or a writer that crashed
+    before flushing) or stale (the data file was rewritten); neither may drop or garble records.
+    """
+    size = len(data)
+    if not offsets:
+        return _scan_offsets(data) if size else offsets
+    last = offsets[-1]
+    if last >= size or (last and data[last - 1:last] != b"\n"):
+        return _scan_offsets(data)
+    end = data.find(b"\n", last)
+    if end != -1 and end + 1 < size:
+        return _scan_offsets(data, end + 1, offsets)
+    return offsets
+
+
+def _trim_partial_record(path: str) -> int:
+    """Cut off a last line with no newline (a writer that died mid-record); returns the new file size.
+
+    Appending after such a fragment would glue the next record onto it and lose both.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if data[-1:] == b"\n":
+            return len(data)
+        end = data.rfind(b"\n") + 1
+    with open(path, "r+b") as f:
+        f.truncate(end)
+    return end
+
+
+def build_index(path: str) -> array:
+    """Rebuild the offset index of a JSON Lines file by scanning it through a memory map."""
+    offsets = array("Q")
+    if os.path.getsize(path):
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            offsets = _scan_offsets(data)
+    with open(path + INDEX_SUFFIX, "wb") as f:
+        offsets.tofile(f)
+    return offsets
+
+
+# Writer: Appends Computers, MealPlans or plain dicts to one JSON Lines file
+class RecordWriter:
+    def __init__(self, path: str, buffer_size: int = 1 << 20):
+        """Paths ending in ``.gz`` are gzip-compressed; those can be streamed back but not random-accessed."""
+        self.path = path
+        self.compressed = path.endswith(".gz")
+        self.count = 0
+        self._offsets = array("Q")
+        if self.compressed:
+            self._file = io.BufferedWriter(gzip.open(path, "ab"), buffer_size)
+            self._index_file = None
+            return
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size:
+            size = _trim_partial_record(path)
+        # New offsets are appended to the index, so it has to match the data before writing
+        if not size:
+            if os.path.exists(path + INDEX_SUFFIX):
+                open(path + INDEX_SUFFIX, "wb").close()  # left over entries would point past the data
+        elif not os.path.exists(path + INDEX_SUFFIX):
+            build_index(path)
+        else:
+            stored = _read_index(path + INDEX_SUFFIX)
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                offsets = _checked_offsets(data, array("Q", stored))
+            if offsets != stored:
+                with open(path + INDEX_SUFFIX, "wb") as f:
+                    offsets.tofile(f)
+        self._file = open(path, "ab", buffering=buffer_size)
+        self._index_file = open(path + INDEX_SUFFIX, "ab")
+        self._offset = self._file.tell()
+
+    def write(self, record) -> None:
+        line = json.dumps(_as_dict(record), separators=(",", ":")).encode() + b"\n"
+        self._file.write(line)
+        if self._index_file is not None:
+            self._offsets.append(self._offset)
+            self._offset += len(line)
+        self.count += 1
+
+    def write_many(self, records: Iterable) -> int:
+        start = self.count
+        for record in records:
+            self.write(record)
+        return self.count - start
+
+    def flush(self) -> None:
+        self._file.flush()
+        if self._index_file is not None:
+            self._offsets.tofile(self._index_file)
+            del self._offsets[:]
+            self._index_file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+        if self._index_file is not None:
+            self._index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# Reader: Random access to records by index through a memory map, without loading the file
+class RecordReader:
+    def __init__(self, path: str, record_type: Optional[Callable[[Dict], object]] = None):
+        """``record_type`` is applied to each decoded dict, e.g. ``Computer.from_dict``."""
+        if path.endswith(".gz"):
+            raise ValueError(f"Compressed files only support sequential reads: {path}")
+        self.path = path
+        self.record_type = record_type
+        self._file = open(path, "rb")
+        self._size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._size else b""
+        self._offsets = self._load_index()
+
+    def _load_index(self) -> array:
+        index_path = self.path + INDEX_SUFFIX
+        if os.path.exists(index_path):
+            return _checked_offsets(self._map, _read_index(index_path))
+        return _scan_offsets(self._map)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self._offsets)
+        if not 0 <= index < len(self._offsets):
+            raise IndexError(f"Record index out of range: {index}")
+        start = self._offsets[index]
+        end = self._offsets[index + 1] if index + 1 < len(self._offsets) else self._size
+        record = json.loads(self._map[start:end])
+        return self.record_type(record) if self.record_type else record
+
+    def __iter__(self) -> Iterator:
+        for index in range(len(self._offsets)):
+            yield self[index]
+
+    def close(self) -> None:
+        if self._size:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def iter_records(path: str, record_type: Optional[Callable[[Dict], object]] = None) -> Iterator:
+    """Stream every record from a plain or gzip-compressed JSON Lines file."""
+    if path.endswith(".gz"):
+        with gzip.open(path, "rb") as f:
+            for line in f:
+                record = json.loads(line)
+                yield record_type(record) if record_type else record
+    else:
+        with RecordReader(path, record_type) as reader:
+            yield from reader
+
+
+# Example usage
+if __name__ == "__main__":
+    # Only the benchmark below needs these
+    import shutil
+    import tempfile
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    computer = ComputerDirector.preset("high_end_desktop")
+    meal_plan = MealPlanDirector.build_gluten_free_plan(StandardMealPlanBuilder())
+    records = [computer if i % 2 == 0 else meal_plan for i in range(count)]
+    workdir = tempfile.mkdtemp()
+
+    try:
+        # Benchmark: one json.dump(indent=4) file per record, as save_to_file does
+        start = time.perf_counter()
+        for i, record in enumerate(records):
+            with open(os.path.join(workdir, f"record_{i}.json"), "w") as f:
+                json.dump(record.to_dict(), f, indent=4)
+        per_file_write = time.perf_counter() - start
+        start = time.perf_counter()
+        for i in range(count):
+            with open(os.path.join(workdir, f"record_{i}.json")) as f:
+                json.load(f)
+        per_file_read = time.perf_counter() - start
+
+        for name in ("records.jsonl", "records.jsonl.gz"):
+            path = os.path.join(workdir, name)
+            start = time.perf_counter()
+            with RecordWriter(path) as writer:
+                writer.write_many(records)
+            write_elapsed = time.perf_counter() - start
+            start = time.perf_counter()
+            read_count = sum(1 for _ in iter_records(path))
+            read_elapsed = time.perf_counter() - start
+            print(f"{name}: write {count / write_elapsed:,.0f} rec/s, read {read_count / read_elapsed:,.0f} rec/s, "
+                  f"{os.path.getsize(path) / 1e6:.1f} MB")
+
+        with RecordReader(os.path.join(workdir, "records.jsonl"), Computer.from_dict) as reader:
+            start = time.perf_counter()
+            for i in range(0, count, 2):
+                reader[i]
+            print(f"random access: {count // 2 / (time.perf_counter() - start):,.0f} rec/s")
+            print(reader[-2])
+        with RecordReader(os.path.join(workdir, "records.jsonl"), MealPlan.from_dict) as reader:
+            print(reader[1])
+
+        print(f"per-file JSON: write {count / per_file_write:,.0f} rec/s, read {count / per_file_read:,.0f} rec/s")
+    finally:
+        shutil.rmtree(workdir)
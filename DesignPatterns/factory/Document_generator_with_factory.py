@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+from typing import Callable
 import os
+import sys
+from factory_registry import FactoryRegistry, SINGLETON
 
 # Abstract Product: Defines the interface for document generators
 class DocumentGenerator(ABC):
@@ -12,6 +13,9 @@ class DocumentGenerator(ABC):
 # Concrete Product: PDF Document Generator
 class PdfDocumentGenerator(DocumentGenerator):
     def generate(self, data: dict, output_path: str) -> None:
+        # reportlab is only needed for PDF output, so it is imported on first use
+        from reportlab.lib.pagesizes import letter
+        from reportlab.pdfgen import canvas
         c = canvas.Canvas(output_path, pagesize=letter)
         c.setFont("Helvetica", 12)
         c.drawString(100, 750, "Sales Report")
@@ -26,16 +30,24 @@ class PdfDocumentGenerator(DocumentGenerator):
         print(f"PDF document generated at {output_path}")
 
 # Concrete Product: HTML Document Generator
+# Text-based generators split a report into header, one formatted line per item and footer,
+# so the item lines can also be rendered in chunks (see parallel_report.py)
 class HtmlDocumentGenerator(DocumentGenerator):
-    def generate(self, data: dict, output_path: str) -> None:
-        html_content = """<!DOCTYPE html>
+    ITEM_FORMAT = "        <li>{}: {} units at ${:.2f} each</li>\n"
+    FOOTER = """    </ul>
+</body>
+</html>
+"""
+
+    def header(self, data: dict) -> str:
+        return f"""<!DOCTYPE html>
 <html>
 <head>
     <title>Sales Report</title>
     <style>
-        body { font-family: Arial, sans-serif; margin: 20px; }
-        h1 { color: #333; }
-        ul { list-style-type: disc; margin-left: 20px; }
+        body {{ font-family: Arial, sans-serif; margin: 20px; }}
+        h1 {{ color: #333; }}
+        ul {{ list-style-type: disc; margin-left: 20px; }}
     </style>
 </head>
 <body>
@@ -44,42 +56,53 @@ class HtmlDocumentGenerator(DocumentGenerator):
     <p><strong>Total Sales:</strong> ${data['total_sales']:.2f}</p>
     <h3>Items Sold:</h3>
     <ul>
-""".format(data=data)
-        for item in data['items']:
-            html_content += f"        <li>{item['name']}: {item['quantity']} units at ${item['price']:.2f} each</li>\n"
-        html_content += """    </ul>
-</body>
-</html>
 """
+
+    def generate(self, data: dict, output_path: str) -> None:
+        item_format = self.ITEM_FORMAT.format
+        html_content = self.header(data)
+        html_content += "".join([item_format(item['name'], item['quantity'], item['price']) for item in data['items']])
+        html_content += self.FOOTER
         with open(output_path, 'w') as f:
             f.write(html_content)
         print(f"HTML document generated at {output_path}")
 
 # Concrete Product: Plain Text Document Generator
 class TextDocumentGenerator(DocumentGenerator):
+    ITEM_FORMAT = "- {}: {} units at ${:.2f} each\n"
+    FOOTER = ""
+
+    def header(self, data: dict) -> str:
+        return f"Sales Report\nDate: {data['date']}\nTotal Sales: ${data['total_sales']:.2f}\nItems Sold:\n"
+
     def generate(self, data: dict, output_path: str) -> None:
-        text_content = f"Sales Report\n"
-        text_content += f"Date: {data['date']}\n"
-        text_content += f"Total Sales: ${data['total_sales']:.2f}\n"
-        text_content += "Items Sold:\n"
-        for item in data['items']:
-            text_content += f"- {item['name']}: {item['quantity']} units at ${item['price']:.2f} each\n"
+        item_format = self.ITEM_FORMAT.format
+        text_content = self.header(data)
+        text_content += "".join([item_format(item['name'], item['quantity'], item['price']) for item in data['items']])
+        text_content += self.FOOTER
         with open(output_path, 'w') as f:
             f.write(text_content)
         print(f"Text document generated at {output_path}")
 
 # Factory: Creates the appropriate document generator
 class DocumentGeneratorFactory:
+    registry = FactoryRegistry("document type")
+
     @staticmethod
     def get_document_generator(doc_type: str) -> DocumentGenerator:
-        if doc_type.lower() == "pdf":
-            return PdfDocumentGenerator()
-        elif doc_type.lower() == "html":
-            return HtmlDocumentGenerator()
-        elif doc_type.lower() == "text":
-            return TextDocumentGenerator()
-        else:
-            raise ValueError(f"Unknown document type: {doc_type}")
+        return DocumentGeneratorFactory.registry.create(doc_type)
+
+    @staticmethod
+    def register_document_generator(doc_type: str, generator_class: Callable[[], DocumentGenerator],
+                                    scope: str = SINGLETON, replace: bool = False) -> None:
+        DocumentGeneratorFactory.registry.register(doc_type, generator_class, scope, replace)
+
+# Generators keep no state between documents, so each type is built once and shared
+DocumentGeneratorFactory.registry.register_many([
+    ("pdf", PdfDocumentGenerator, SINGLETON),
+    ("html", HtmlDocumentGenerator, SINGLETON),
+    ("text", TextDocumentGenerator, SINGLETON),
+])
 
 # Client code: Generates a document based on user input
 def generate_sales_report(data: dict, doc_type: str, output_path: str) -> None:
@@ -93,6 +116,11 @@ def generate_sales_report(data: dict, doc_type: str, output_path: str) -> None:
 
 # Example usage
 if __name__ == "__main__":
+    # Sampled profiling of the hot paths when DESIGNPATTERNS_PROFILE_RATE is set; profiling.py lives in the folder above
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import profiling
+    profiling.install_from_env()
+
     # Sample sales report data
     sales_data = {
         "date": "2025-06-11",
@@ -1,11 +1,25 @@
 import json
-import types
+import os
+import sys
+from types import MappingProxyType
+from factory_registry import FactoryRegistry, PER_CALL
+from method_compiler import MethodCompileError, compile_method
+
+
+def _make_init(attributes):
+    # Built per class so each __init__ closes over its own class's attributes
+    def init(self, **kwargs):
+        for attr_name, attr_value in attributes.items():
+            setattr(self, attr_name, attr_value)
+        for attr_name, attr_value in kwargs.items():
+            setattr(self, attr_name, attr_value)
+    return init
 
 
 class DynamicClassFactory:
     def __init__(self, config_path):
         self.config_path = config_path
-        self.classes = {}
+        self.registry = FactoryRegistry("class", missing="Class {key} not found in config", case_sensitive=True)
         self._load_config()
 
     def _load_config(self):
@@ -13,53 +27,58 @@ class DynamicClassFactory:
         with open(self.config_path, 'r') as f:
             config = json.load(f)
 
+        registrations = []
         for class_config in config['classes']:
             class_name = class_config['name']
             attributes = class_config.get('attributes', {})
             methods = class_config.get('methods', {})
 
-            # Create method dictionary for dynamic class
+            # Create method dictionary for dynamic class. A method is either a body string, whose free
+            # names become its parameters, or {"params": [...], "body": "..."} with them declared.
             method_dict = {}
-            for method_name, method_body in methods.items():
-                # Create method from string
-                method_code = f"def {method_name}(self, *args, **kwargs):\n"
-                for line in method_body.split('\n'):
-                    method_code += f"    {line}\n"
-
-                # Execute method code in a new namespace
-                namespace = {}
-                exec(method_code, namespace)
-                method_dict[method_name] = namespace[method_name]
-
-            # Create class dynamically
-            def init(self, **kwargs):
-                for attr_name, attr_value in attributes.items():
-                    setattr(self, attr_name, attr_value)
-                for attr_name, attr_value in kwargs.items():
-                    setattr(self, attr_name, attr_value)
-
-            # Add __init__ to method dictionary
-            method_dict['__init__'] = init
+            for method_name, method_spec in methods.items():
+                if isinstance(method_spec, str):
+                    body, params = method_spec, None
+                else:
+                    body, params = method_spec['body'], method_spec.get('params', [])
+                try:
+                    method_dict[method_name] = compile_method(f"{class_name}.{method_name}", body, params)
+                except MethodCompileError as e:
+                    raise MethodCompileError(f"{class_name}.{method_name}: {e}") from None
+
+            method_dict['__init__'] = _make_init(attributes)
 
             # Create class using type()
             dynamic_class = type(class_name, (), method_dict)
-            self.classes[class_name] = dynamic_class
+            # An optional "scope" (per_call, per_thread, singleton) caches instances of the class
+            registrations.append((class_name, dynamic_class, class_config.get('scope', PER_CALL)))
+
+        self.registry.register_many(registrations, replace=True)
+
+    @property
+    def classes(self):
+        """Read-only mapping of class name to the generated class; register new classes through the registry."""
+        return MappingProxyType({registration.key: registration.constructor
+                                 for registration in self.registry.registrations()})
 
     def create_instance(self, class_name, **kwargs):
         """Create an instance of a dynamic class."""
-        if class_name not in self.classes:
-            raise ValueError(f"Class {class_name} not found in config")
-        return self.classes[class_name](**kwargs)
+        return self.registry.create(class_name, **kwargs)
 
     def get_available_classes(self):
         """Return list of available class names."""
-        return list(self.classes.keys())
+        return self.registry.keys()
 
 
 # Example usage
 if __name__ == "__main__":
+    # Sampled profiling of the hot paths when DESIGNPATTERNS_PROFILE_RATE is set; profiling.py lives in the folder above
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import profiling
+    profiling.install_from_env()
+
     # Create factory with config file
-    factory = DynamicClassFactory("ai_chat_config.json")
+    factory = DynamicClassFactory(os.path.join(os.path.dirname(os.path.abspath(__file__)), "ai_config_chat.json"))
 
     # Print available classes
     print("Available AI Chat APIs:", factory.get_available_classes())
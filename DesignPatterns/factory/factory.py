@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from typing import Callable
+from factory_registry import FactoryRegistry, SINGLETON
 
 # Abstract Product: Defines the interface for payment processors
 class PaymentProcessor(ABC):
@@ -27,16 +29,23 @@ class CryptoProcessor(PaymentProcessor):
 
 # Factory: Creates the appropriate payment processor
 class PaymentProcessorFactory:
+    registry = FactoryRegistry("payment type")
+
     @staticmethod
     def get_payment_processor(payment_type: str) -> PaymentProcessor:
-        if payment_type.lower() == "credit_card":
-            return CreditCardProcessor()
-        elif payment_type.lower() == "paypal":
-            return PayPalProcessor()
-        elif payment_type.lower() == "crypto":
-            return CryptoProcessor()
-        else:
-            raise ValueError(f"Unknown payment type: {payment_type}")
+        return PaymentProcessorFactory.registry.create(payment_type)
+
+    @staticmethod
+    def register_payment_processor(payment_type: str, processor_class: Callable[[], PaymentProcessor],
+                                   scope: str = SINGLETON, replace: bool = False) -> None:
+        PaymentProcessorFactory.registry.register(payment_type, processor_class, scope, replace)
+
+# The processors keep no per-payment state, so each type is built once and shared
+PaymentProcessorFactory.registry.register_many([
+    ("credit_card", CreditCardProcessor, SINGLETON),
+    ("paypal", PayPalProcessor, SINGLETON),
+    ("crypto", CryptoProcessor, SINGLETON),
+])
 
 # Client code: Uses the factory to process payments
 def process_order(amount: float, payment_type: str):
@@ -0,0 +1,167 @@
+"""Thread-safe key -> constructor registry shared by the factories.
+
+Registration is copy-on-write: ``register()`` builds a new table under a lock
+and swaps it in with a single assignment, so ``create()`` reads whichever table
+is current without taking a lock. Each key has a scope that decides what
+``create()`` hands back:
+
+- PER_CALL: a new object on every call (the factories' original behaviour)
+- PER_THREAD: one object per thread, built on that thread's first call
+- SINGLETON: one object for the whole process, built on the first call
+
+    registry = FactoryRegistry("payment type")
+    registry.register("credit_card", CreditCardProcessor, scope=SINGLETON)
+    processor = registry.create("Credit_Card")
+"""
+import threading
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+PER_CALL = "per_call"
+PER_THREAD = "per_thread"
+SINGLETON = "singleton"
+SCOPES = (PER_CALL, PER_THREAD, SINGLETON)
+
+_MISSING = object()
+
+
+class Registration(NamedTuple):
+    key: str
+    constructor: Callable[..., Any]
+    scope: str
+    provider: Callable[[], Any]  # the constructor itself for PER_CALL, a caching wrapper otherwise
+
+
+# Providers are closures rather than classes with __call__: calling a closure is several times cheaper
+# and this sits on every lookup. Each carries a clear() that drops what it has cached.
+def _singleton_provider(constructor: Callable[[], Any]) -> Callable[[], Any]:
+    lock = threading.Lock()
+    instance = _MISSING
+
+    def provider():
+        nonlocal instance
+        if instance is _MISSING:
+            with lock:
+                # Double-checked locking, as in threadsafe_singleton.py
+                if instance is _MISSING:
+                    instance = constructor()
+        return instance
+
+    def clear():
+        nonlocal instance
+        with lock:
+            instance = _MISSING
+
+    provider.clear = clear
+    return provider
+
+
+# One instance per thread; threads never contend for it, so no lock is needed
+def _per_thread_provider(constructor: Callable[[], Any]) -> Callable[[], Any]:
+    local = threading.local()
+
+    def provider():
+        try:
+            return local.instance
+        except AttributeError:
+            instance = local.instance = constructor()
+            return instance
+
+    def clear():
+        # Swapping in a fresh threading.local drops every thread's instance at once
+        nonlocal local
+        local = threading.local()
+
+    provider.clear = clear
+    return provider
+
+
+_PROVIDERS = {SINGLETON: _singleton_provider, PER_THREAD: _per_thread_provider}
+
+
+class FactoryRegistry:
+    def __init__(self, kind: str, missing: str = "Unknown {kind}: {key}", case_sensitive: bool = False):
+        self.kind = kind
+        self.missing = missing  # message of the ValueError raised for an unknown key
+        self.case_sensitive = case_sensitive
+        self._entries: Dict[str, Registration] = {}
+        self._lock = threading.Lock()  # serializes writers only; readers never take it
+
+    def _normalize(self, key: str) -> str:
+        return key if self.case_sensitive else key.lower()
+
+    def _registration(self, key: str, constructor: Callable[..., Any], scope: str) -> Registration:
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown scope: {scope}")
+        provider = _PROVIDERS[scope](constructor) if scope in _PROVIDERS else constructor
+        return Registration(self._normalize(key), constructor, scope, provider)
+
+    def register(self, key: str, constructor: Callable[..., Any], scope: str = PER_CALL,
+                 replace: bool = False) -> Registration:
+        """Add a constructor under ``key``; replacing an existing key also drops its cached instances."""
+        return self.register_many([(key, constructor, scope)], replace)[0]
+
+    def register_many(self, entries: Iterable[Tuple[str, Callable[..., Any], str]],
+                      replace: bool = False) -> List[Registration]:
+        """Register several ``(key, constructor, scope)`` entries with a single table swap."""
+        registrations = [self._registration(key, constructor, scope) for key, constructor, scope in entries]
+        with self._lock:
+            table = dict(self._entries)
+            for registration in registrations:
+                if registration.key in table and not replace:
+                    raise ValueError(f"{self.kind} already registered: {registration.key}")
+                table[registration.key] = registration
+            self._entries = table
+        return registrations
+
+    def unregister(self, key: str) -> Registration:
+        with self._lock:
+            table = dict(self._entries)
+            registration = table.pop(self._normalize(key), None)
+            if registration is None:
+                raise ValueError(self.missing.format(kind=self.kind, key=key))
+            self._entries = table
+        return registration
+
+    def create(self, key: str, **kwargs) -> Any:
+        """Return the object for ``key``; keyword arguments are only accepted for PER_CALL keys."""
+        try:
+            registration = self._entries[key if self.case_sensitive else key.lower()]
+        except KeyError:
+            raise ValueError(self.missing.format(kind=self.kind, key=key)) from None
+        if not kwargs:
+            return registration.provider()
+        if registration.scope != PER_CALL:
+            raise ValueError(f"{self.kind} {key} is cached per {registration.scope} and takes no arguments")
+        return registration.constructor(**kwargs)
+
+    def get(self, key: str) -> Registration:
+        registration = self._entries.get(self._normalize(key))
+        if registration is None:
+            raise ValueError(self.missing.format(kind=self.kind, key=key))
+        return registration
+
+    def keys(self) -> List[str]:
+        """Registered keys in registration order."""
+        return list(self._entries)
+
+    def registrations(self) -> List[Registration]:
+        return list(self._entries.values())
+
+    def describe(self) -> List[Dict[str, str]]:
+        return [{"key": registration.key, "scope": registration.scope,
+                 "constructor": f"{registration.constructor.__module__}.{registration.constructor.__qualname__}"}
+                for registration in self._entries.values()]
+
+    def clear_cache(self, key: Optional[str] = None):
+        """Drop cached instances for ``key``, or for every key; they are rebuilt on next use."""
+        registrations = [self.get(key)] if key is not None else self._entries.values()
+        for registration in registrations:
+            if registration.scope in _PROVIDERS:
+                registration.provider.clear()
+
+    def __contains__(self, key: str) -> bool:
+        return self._normalize(key) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
@@ -0,0 +1,299 @@
+"""Opt-in timing and counters for the factories and builders.
+
+Nothing is measured until ``enable()`` is called: it swaps the instrumented
+methods on their classes for timing wrappers, and ``disable()`` puts the
+originals back, so there is no cost at all while instrumentation is off.
+
+    import instrumentation
+    instrumentation.enable(sample_every=100)   # time 1% of calls, count all of them
+    instrumentation.enable(steps=True)         # also time every builder step, at a cost per step
+    ...  # use the factories and builders as usual
+    print(instrumentation.INSTRUMENTATION.to_prometheus())
+    instrumentation.INSTRUMENTATION.dump_json("metrics.json")
+    instrumentation.disable()
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Histogram upper bounds in seconds, from 1 microsecond to 10 seconds
+BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3,
+           2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+# Per-operation call/error counters plus a latency histogram over the sampled calls
+class Histogram:
+    __slots__ = ("operation", "sample_every", "errors", "sampled", "total", "bucket_counts", "_local", "_cells",
+                 "_lock")
+
+    def __init__(self, operation: str, sample_every: int = 1):
+        self.operation = operation
+        self.sample_every = sample_every
+        self.errors = 0
+        self.sampled = 0
+        self.total = 0.0
+        self.bucket_counts = [0] * (len(BUCKETS) + 1)  # last slot is +Inf
+        # Calls are counted per thread, so counting an unsampled call takes no lock
+        self._local = threading.local()
+        self._cells: List[List[int]] = []
+        self._lock = threading.Lock()
+
+    def count_call(self) -> int:
+        """Count one call and return how many calls this thread has made."""
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._new_cell()
+        cell[0] += 1
+        return cell[0]
+
+    def _new_cell(self) -> List[int]:
+        cell = self._local.cell = [0]
+        with self._lock:
+            self._cells.append(cell)
+        return cell
+
+    @property
+    def count(self) -> int:
+        with self._lock:
+            return sum(cell[0] for cell in self._cells)
+
+    def error(self):
+        with self._lock:
+            self.errors += 1
+
+    def observe(self, seconds: float, error: bool = False):
+        with self._lock:
+            self.sampled += 1
+            self.total += seconds
+            self.bucket_counts[bisect_left(BUCKETS, seconds)] += 1
+            if error:
+                self.errors += 1
+
+    def to_dict(self) -> Dict:
+        calls = self.count
+        return {"count": calls, "errors": self.errors,
+                "error_rate": self.errors / calls if calls else 0.0,
+                "sampled": self.sampled, "sum_seconds": self.total,
+                "mean_seconds": self.total / self.sampled if self.sampled else 0.0,
+                "buckets": {str(bound): hits for bound, hits in zip(BUCKETS + ("+Inf",), self.bucket_counts)}}
+
+
+def _timed(function: Callable, histogram: Histogram, failure: Optional[Callable[[object], bool]]) -> Callable:
+    perf_counter = time.perf_counter
+    local = histogram._local
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        # count_call() inlined: this runs on every call, sampled or not
+        try:
+            cell = local.cell
+        except AttributeError:
+            cell = histogram._new_cell()
+        cell[0] += 1
+        # Unsampled calls are only counted; every sample_every-th call is also timed
+        if cell[0] % histogram.sample_every:
+            try:
+                result = function(*args, **kwargs)
+            except Exception:
+                histogram.error()
+                raise
+            if failure is not None and failure(result):
+                histogram.error()
+            return result
+        start = perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        except Exception:
+            histogram.observe(perf_counter() - start, True)
+            raise
+        histogram.observe(perf_counter() - start, failure is not None and failure(result))
+        return result
+    return wrapper
+
+
+# Registry of histograms plus the method patches that feed them
+class Instrumentation:
+    def __init__(self, sample_every: int = 1):
+        """``sample_every=N`` times one call in N; call and error counts stay exact either way."""
+        if sample_every < 1:
+            raise ValueError(f"sample_every must be positive: {sample_every}")
+        self.sample_every = sample_every
+        self.histograms: Dict[str, Histogram] = {}
+        self._patches: List[Tuple[type, str, object]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._patches)
+
+    def set_sample_every(self, sample_every: int):
+        """Change the sampling rate of this registry and of every histogram it already holds."""
+        if sample_every < 1:
+            raise ValueError(f"sample_every must be positive: {sample_every}")
+        with self._lock:
+            self.sample_every = sample_every
+            for histogram in self.histograms.values():
+                histogram.sample_every = sample_every
+
+    def histogram(self, operation: str) -> Histogram:
+        with self._lock:
+            if operation not in self.histograms:
+                self.histograms[operation] = Histogram(operation, self.sample_every)
+            return self.histograms[operation]
+
+    def instrument(self, cls: type, method_name: str, operation: Optional[str] = None,
+                   failure: Optional[Callable[[object], bool]] = None):
+        """Time ``cls.method_name``; ``failure(result)`` marks a returned value as an error."""
+        import inspect  # only needed once instrumentation is enabled; it is slow to import
+        original = inspect.getattr_static(cls, method_name)
+        histogram = self.histogram(operation or f"{cls.__name__}.{method_name}")
+        if isinstance(original, staticmethod):
+            replacement = staticmethod(_timed(original.__func__, histogram, failure))
+        elif isinstance(original, classmethod):
+            replacement = classmethod(_timed(original.__func__, histogram, failure))
+        else:
+            replacement = _timed(original, histogram, failure)
+        setattr(cls, method_name, replacement)
+        self._patches.append((cls, method_name, original))
+
+    def instrument_hierarchy(self, base: type, method_names: Iterable[str],
+                             failure: Optional[Callable[[object], bool]] = None):
+        """Instrument every concrete implementation of ``method_names`` in ``base`` and its subclasses."""
+        pending = [base]
+        seen = set()
+        while pending:
+            cls = pending.pop()
+            if cls in seen:
+                continue
+            seen.add(cls)
+            pending.extend(cls.__subclasses__())
+            for method_name in method_names:
+                method = cls.__dict__.get(method_name)
+                if method is not None and not getattr(method, "__isabstractmethod__", False):
+                    self.instrument(cls, method_name, failure=failure)
+
+    def restore(self):
+        while self._patches:
+            cls, method_name, original = self._patches.pop()
+            setattr(cls, method_name, original)
+
+    def reset(self):
+        """Drop collected metrics. Wrappers hold on to their histograms, so disable first."""
+        if self.enabled:
+            raise ValueError("Disable instrumentation before resetting its metrics")
+        with self._lock:
+            self.histograms.clear()
+
+    def to_dict(self) -> Dict:
+        return {operation: histogram.to_dict() for operation, histogram in sorted(self.histograms.items())}
+
+    def dump_json(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+    def to_prometheus(self) -> str:
+        lines = ["# HELP designpatterns_call_seconds Latency of instrumented factory and builder calls.",
+                 "# TYPE designpatterns_call_seconds histogram"]
+        for operation, histogram in sorted(self.histograms.items()):
+            label = f'operation="{operation}"'
+            cumulative = 0
+            for bound, count in zip(BUCKETS + ("+Inf",), histogram.bucket_counts):
+                cumulative += count
+                lines.append(f'designpatterns_call_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f"designpatterns_call_seconds_sum{{{label}}} {histogram.total}")
+            lines.append(f"designpatterns_call_seconds_count{{{label}}} {histogram.sampled}")
+        lines += ["# HELP designpatterns_calls_total Instrumented calls, sampled or not.",
+                  "# TYPE designpatterns_calls_total counter"]
+        for operation, histogram in sorted(self.histograms.items()):
+            lines.append(f'designpatterns_calls_total{{operation="{operation}"}} {histogram.count}')
+        lines += ["# HELP designpatterns_call_errors_total Instrumented calls that raised or reported failure.",
+                  "# TYPE designpatterns_call_errors_total counter"]
+        for operation, histogram in sorted(self.histograms.items()):
+            lines.append(f'designpatterns_call_errors_total{{operation="{operation}"}} {histogram.errors}')
+        return "\n".join(lines) + "\n"
+
+
+INSTRUMENTATION = Instrumentation()
+
+# Director methods that each run one complete build
+BUILDS = ("build_from_spec", "build_high_end_desktop", "build_budget_desktop", "build_standard_laptop",
+          "build_vegan_plan", "build_keto_plan")
+
+# Individual builder steps; a wrapper on each costs more than the step itself, so these are opt-in
+BUILDER_STEPS = ("set_cpu", "set_motherboard", "set_ram", "set_storage", "set_graphics_card",
+                 "set_power_supply", "set_cooling_system", "set_dietary_preference", "set_breakfast",
+                 "set_lunch", "set_dinner", "add_snack", "remove_snack")
+
+
+def add_pattern_paths():
+    """Put the builder, factory and singleton folders on sys.path; their modules import siblings by name.
+
+    Called by ``enable()`` and ``profiling.install()`` before they import the pattern modules,
+    never on import, so importing this module has no side effects.
+    """
+    for package in ("builder", "factory", "singleton"):
+        path = os.path.join(_ROOT, package)
+        if path not in sys.path:
+            sys.path.append(path)
+
+
+def _default_targets(instrumentation: Instrumentation, steps: bool):
+    add_pattern_paths()
+    # Each module is optional: e.g. the document factory needs reportlab for PDF output
+    try:
+        from factory import PaymentProcessor, PaymentProcessorFactory
+        instrumentation.instrument(PaymentProcessorFactory, "get_payment_processor")
+        instrumentation.instrument_hierarchy(PaymentProcessor, ["process_payment"], failure=lambda paid: not paid)
+    except ImportError:
+        pass
+    try:
+        from Document_generator_with_factory import DocumentGenerator, DocumentGeneratorFactory
+        instrumentation.instrument(DocumentGeneratorFactory, "get_document_generator")
+        instrumentation.instrument_hierarchy(DocumentGenerator, ["generate"])
+    except ImportError:
+        pass
+    try:
+        from Dynamic_factory_class_creation import DynamicClassFactory
+        instrumentation.instrument(DynamicClassFactory, "create_instance")
+    except ImportError:
+        pass
+    try:
+        from builder_computer import ComputerBuilder, ComputerDirector
+        instrumentation.instrument_hierarchy(ComputerDirector, BUILDS)
+        if steps:
+            instrumentation.instrument_hierarchy(ComputerBuilder, BUILDER_STEPS)
+    except ImportError:
+        pass
+    try:
+        from meal_planner_builder import MealPlanBuilder, MealPlanDirector
+        instrumentation.instrument_hierarchy(MealPlanDirector, BUILDS)
+        if steps:
+            instrumentation.instrument_hierarchy(MealPlanBuilder, BUILDER_STEPS)
+    except ImportError:
+        pass
+
+
+def enable(instrumentation: Instrumentation = INSTRUMENTATION, sample_every: Optional[int] = None,
+           steps: bool = False) -> Instrumentation:
+    """Instrument the factory lookups, generate, process_payment, create_instance and whole director builds.
+
+    ``steps=True`` also times every set_* builder step. Off by default: a build is only a few
+    microseconds, and a wrapper on each of its steps would more than double that.
+    """
+    if sample_every is not None:
+        instrumentation.set_sample_every(sample_every)
+    if not instrumentation.enabled:
+        _default_targets(instrumentation, steps)
+    return instrumentation
+
+
+def disable(instrumentation: Instrumentation = INSTRUMENTATION):
+    instrumentation.restore()
@@ -0,0 +1,461 @@
+"""Rate-limited, circuit-breaking dispatch in front of PaymentProcessorFactory.
+
+Each payment type gets its own lane: a bounded queue, a few worker threads, a
+token bucket and a circuit breaker. A slow or failing gateway therefore only
+backs up its own lane:
+
+- the token bucket caps calls per second to the processor;
+- a full queue pushes back on callers (``submit`` blocks up to ``timeout``
+  and then raises QueueFullError) instead of letting work pile up;
+- the breaker opens when the error rate or the share of slow calls over the
+  last ``window`` calls crosses its threshold. While open, ``submit`` fails
+  fast with CircuitOpenError; after ``reset_timeout`` one trial call is let
+  through, and its outcome closes or re-opens the circuit.
+
+Latency, queue wait, queue depth and rejections are exported through
+``to_dict()`` and ``to_prometheus()``.
+
+    with PaymentDispatcher(rate_limits={"paypal": 50}) as dispatcher:
+        future = dispatcher.submit(100.50, "paypal")
+        paid = future.result()
+"""
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from queue import Empty, Full, Queue
+from typing import Callable, Dict, List, Optional
+
+if __name__ == "__main__":
+    # factory.py lives in the sibling factory folder, which is not a package
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "factory"))
+
+from factory import PaymentProcessor, PaymentProcessorFactory
+from instrumentation import Instrumentation
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class DispatchRejected(RuntimeError):
+    pass
+
+
+class QueueFullError(DispatchRejected):
+    pass
+
+
+class CircuitOpenError(DispatchRejected):
+    pass
+
+
+class QueueTimeoutError(DispatchRejected):
+    pass
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        """``rate`` tokens per second, bursting up to ``capacity`` (default: one second's worth)."""
+        if rate <= 0:
+            raise ValueError(f"rate must be positive: {rate}")
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how long to wait before using it; 0.0 if one was available.
+
+        The balance may go negative, so concurrent callers are handed consecutive slots
+        instead of all waking up at once for the same token.
+        """
+        with self._lock:
+            now = self._clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+_CALL = object()  # permit for calls made while the circuit is closed
+
+
+class CircuitBreaker:
+    def __init__(self, error_threshold: float = 0.5, slow_call_seconds: float = 1.0, slow_threshold: float = 0.5,
+                 window: int = 20, min_calls: int = 10, reset_timeout: float = 5.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.error_threshold = error_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_threshold = slow_threshold
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.opened = 0  # times the circuit has opened
+        self._outcomes = deque(maxlen=window)  # (failed, slow) for the most recent calls
+        self._opened_at = 0.0
+        self._trial = None  # permit held by the half open trial call
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def allow(self) -> Optional[object]:
+        """Return a permit for one call, or None when the circuit refuses it.
+
+        In half open state the permit is the trial slot itself. Pass it back to ``release()`` or
+        ``record()`` so that only the call holding the trial can free it or decide the circuit.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return _CALL
+            if self.state == OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    return None
+                self.state = HALF_OPEN
+                self._trial = None
+            # Half open: one trial call at a time decides whether to close again
+            if self._trial is not None:
+                return None
+            self._trial = object()
+            return self._trial
+
+    def release(self, permit: object):
+        """Give back a permit from ``allow()`` for a call that never ran."""
+        with self._lock:
+            if permit is self._trial:
+                self._trial = None
+
+    def record(self, seconds: float, failed: bool, permit: object = _CALL):
+        slow = seconds >= self.slow_call_seconds
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if permit is not self._trial:
+                    return  # a call let in before the circuit opened; only the trial decides
+                self._trial = None
+                if failed or slow:
+                    self._open()
+                else:
+                    self.state = CLOSED
+                return
+            if self.state == OPEN:
+                return  # a call that started before the circuit opened
+            self._outcomes.append((failed, slow))
+            calls = len(self._outcomes)
+            if calls >= self.min_calls:
+                failures = sum(failed for failed, _ in self._outcomes)
+                slow_calls = sum(slow for _, slow in self._outcomes)
+                if failures / calls >= self.error_threshold or slow_calls / calls >= self.slow_threshold:
+                    self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.opened += 1
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+
+
+class _Request:
+    __slots__ = ("amount", "future", "enqueued", "permit")
+
+    def __init__(self, amount: float, enqueued: float, permit: object):
+        self.amount = amount
+        self.future = Future()
+        self.enqueued = enqueued
+        self.permit = permit
+
+
+_STOP = object()
+
+
+# One payment type: its queue, workers, rate limit and breaker
+class _Lane:
+    def __init__(self, dispatcher: "PaymentDispatcher", payment_type: str, processor: PaymentProcessor):
+        self.payment_type = payment_type
+        self.processor = processor
+        self.queue = Queue(maxsize=dispatcher.queue_size)
+        rate = dispatcher.rate_limits.get(payment_type)
+        self.bucket = TokenBucket(rate) if rate else None
+        self.breaker = dispatcher.breaker_factory()
+        self.latency = dispatcher.metrics.histogram(f"dispatch.{payment_type}.latency")
+        self.queue_wait = dispatcher.metrics.histogram(f"dispatch.{payment_type}.queue_wait")
+        self.max_depth = 0
+        self.rejected = {"queue_full": 0, "circuit_open": 0, "queue_timeout": 0}
+        self._max_wait = dispatcher.max_wait
+        self.closed = False
+        self._lock = threading.Lock()
+        self.threads = [threading.Thread(target=self._work, name=f"dispatch-{payment_type}-{i}", daemon=True)
+                        for i in range(dispatcher.workers_per_type)]
+        for thread in self.threads:
+            thread.start()
+
+    def _reject(self, reason: str):
+        with self._lock:
+            self.rejected[reason] += 1
+
+    def submit(self, amount: float, timeout: Optional[float]) -> Future:
+        if self.closed:
+            raise DispatchRejected("dispatcher is closed")
+        permit = self.breaker.allow()
+        if permit is None:
+            self._reject("circuit_open")
+            raise CircuitOpenError(f"{self.payment_type} circuit is open")
+        request = _Request(amount, time.perf_counter(), permit)
+        try:
+            self.queue.put(request, timeout=timeout)
+        except Full:
+            self.breaker.release(permit)
+            self._reject("queue_full")
+            raise QueueFullError(f"{self.payment_type} queue is full ({self.queue.maxsize} pending)") from None
+        if self.closed and not any(thread.is_alive() for thread in self.threads):
+            self._fail_pending()  # stop() finished between the check above and the put
+        depth = self.queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth  # a racy high-water mark is good enough for a gauge
+        return request.future
+
+    def _work(self):
+        perf_counter = time.perf_counter
+        while True:
+            request = self.queue.get()
+            if request is _STOP:
+                return
+            if not request.future.set_running_or_notify_cancel():
+                self.breaker.release(request.permit)
+                continue
+            waited = perf_counter() - request.enqueued
+            self.queue_wait.count_call()
+            self.queue_wait.observe(waited)
+            if self._max_wait is not None and waited > self._max_wait:
+                # The caller has most likely given up; don't spend a gateway call on it
+                self.breaker.release(request.permit)
+                self._reject("queue_timeout")
+                request.future.set_exception(QueueTimeoutError(
+                    f"{self.payment_type} payment waited {waited:.3f}s in the queue"))
+                continue
+            if self.bucket is not None:
+                delay = self.bucket.reserve()
+                if delay:
+                    time.sleep(delay)
+            self.latency.count_call()
+            start = perf_counter()
+            try:
+                result = self.processor.process_payment(request.amount)
+            except Exception as e:
+                elapsed = perf_counter() - start
+                self.latency.observe(elapsed, True)
+                self.breaker.record(elapsed, True, request.permit)
+                request.future.set_exception(e)
+                continue
+            elapsed = perf_counter() - start
+            # A declined payment (False) is a failed call for the error rate and the breaker
+            self.latency.observe(elapsed, not result)
+            self.breaker.record(elapsed, not result, request.permit)
+            request.future.set_result(result)
+
+    def stop(self):
+        self.closed = True
+        for _ in self.threads:
+            self.queue.put(_STOP)
+        for thread in self.threads:
+            thread.join()
+        self._fail_pending()
+
+    def _fail_pending(self):
+        # Requests that were queued behind the stop markers would otherwise never complete
+        while True:
+            try:
+                request = self.queue.get_nowait()
+            except Empty:
+                return
+            if request is not _STOP and request.future.set_running_or_notify_cancel():
+                self.breaker.release(request.permit)
+                request.future.set_exception(DispatchRejected("dispatcher is closed"))
+
+    def to_dict(self) -> Dict:
+        return {"queue_depth": self.queue.qsize(), "max_queue_depth": self.max_depth,
+                "queue_size": self.queue.maxsize, "circuit": self.breaker.state,
+                "circuit_opened": self.breaker.opened, "rejected": dict(self.rejected),
+                "latency": self.latency.to_dict(), "queue_wait": self.queue_wait.to_dict()}
+
+
+class PaymentDispatcher:
+    def __init__(self, rate_limits: Optional[Dict[str, float]] = None, queue_size: int = 100,
+                 workers_per_type: int = 4, max_wait: Optional[float] = None,
+                 breaker_factory: Callable[[], CircuitBreaker] = CircuitBreaker,
+                 get_processor: Callable[[str], PaymentProcessor] = PaymentProcessorFactory.get_payment_processor):
+        """``rate_limits`` maps payment type to calls per second; types without an entry are not limited.
+
+        ``max_wait`` fails requests that sat in the queue longer than that many seconds without
+        calling the processor. ``get_processor`` lets tests swap in fake processors.
+        """
+        if queue_size < 1 or workers_per_type < 1:
+            raise ValueError("queue_size and workers_per_type must be positive")
+        self.rate_limits = {payment_type.lower(): rate for payment_type, rate in (rate_limits or {}).items()}
+        self.queue_size = queue_size
+        self.workers_per_type = workers_per_type
+        self.max_wait = max_wait
+        self.breaker_factory = breaker_factory
+        self.get_processor = get_processor
+        self.metrics = Instrumentation()
+        self._lanes: Dict[str, _Lane] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _lane(self, payment_type: str) -> _Lane:
+        key = payment_type.lower()
+        lane = self._lanes.get(key)
+        if lane is None:
+            processor = self.get_processor(payment_type)  # unknown types raise ValueError here, as before
+            with self._lock:
+                if self._closed:
+                    raise DispatchRejected("dispatcher is closed")
+                lane = self._lanes.get(key)
+                if lane is None:
+                    lane = self._lanes[key] = _Lane(self, key, processor)
+        return lane
+
+    def submit(self, amount: float, payment_type: str, timeout: Optional[float] = None) -> Future:
+        """Queue a payment; waits up to ``timeout`` seconds for queue space (None waits indefinitely)."""
+        return self._lane(payment_type).submit(amount, timeout)
+
+    def process(self, amount: float, payment_type: str, timeout: Optional[float] = None) -> bool:
+        """Submit and wait for the processor's answer; ``timeout`` bounds the whole call."""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        future = self.submit(amount, payment_type, timeout)
+        return future.result(None if deadline is None else max(0.0, deadline - time.perf_counter()))
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            lanes = list(self._lanes.values())
+        for lane in lanes:
+            lane.stop()
+
+    def to_dict(self) -> Dict:
+        return {payment_type: lane.to_dict() for payment_type, lane in sorted(self._lanes.items())}
+
+    def to_prometheus(self) -> str:
+        lanes = sorted(self._lanes.items())
+        lines = [self.metrics.to_prometheus().rstrip("\n"),
+                 "# HELP designpatterns_dispatch_queue_depth Payments waiting in each dispatch queue.",
+                 "# TYPE designpatterns_dispatch_queue_depth gauge"]
+        lines += [f'designpatterns_dispatch_queue_depth{{payment_type="{payment_type}"}} {lane.queue.qsize()}'
+                  for payment_type, lane in lanes]
+        lines += ["# HELP designpatterns_dispatch_circuit_open Whether the payment type's circuit is open (1) or not.",
+                  "# TYPE designpatterns_dispatch_circuit_open gauge"]
+        lines += [f'designpatterns_dispatch_circuit_open{{payment_type="{payment_type}"}} '
+                  f'{int(lane.breaker.state != CLOSED)}' for payment_type, lane in lanes]
+        lines += ["# HELP designpatterns_dispatch_rejected_total Payments refused before reaching the processor.",
+                  "# TYPE designpatterns_dispatch_rejected_total counter"]
+        for payment_type, lane in lanes:
+            for reason, count in sorted(lane.rejected.items()):
+                lines.append(f'designpatterns_dispatch_rejected_total{{payment_type="{payment_type}",'
+                             f'reason="{reason}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+class GatewayError(Exception):
+    pass
+
+
+# Local stand-in for a gateway, with faults that can be injected while it is in use
+class FakeProcessor(PaymentProcessor):
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def inject(self, latency: Optional[float] = None, failure_rate: Optional[float] = None):
+        if latency is not None:
+            self.latency = latency
+        if failure_rate is not None:
+            self.failure_rate = failure_rate
+
+    def process_payment(self, amount: float) -> bool:
+        with self._lock:
+            self.calls += 1
+            fail = self._random.random() < self.failure_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise GatewayError(f"gateway error processing ${amount}")
+        return True
+
+
+def fake_processors(payment_types: List[str], **settings) -> Dict[str, FakeProcessor]:
+    return {payment_type: FakeProcessor(**settings) for payment_type in payment_types}
+
+
+# Simulation: one gateway degrades mid-run while the others stay healthy
+if __name__ == "__main__":
+    fakes = fake_processors(["credit_card", "paypal", "crypto"], latency=0.002, seed=7)
+    breaker = lambda: CircuitBreaker(error_threshold=0.5, slow_call_seconds=0.05, window=20, min_calls=10,
+                                     reset_timeout=0.5)
+    dispatcher = PaymentDispatcher(rate_limits={"credit_card": 500, "paypal": 200, "crypto": 100}, queue_size=50,
+                                   workers_per_type=4, max_wait=0.5, breaker_factory=breaker,
+                                   get_processor=lambda payment_type: fakes[payment_type.lower()])
+    outcomes = {payment_type: {"paid": 0, "gateway_error": 0, "rejected": 0} for payment_type in fakes}
+    outcomes_lock = threading.Lock()
+
+    def client(payment_type: str, requests: int):
+        for i in range(requests):
+            try:
+                dispatcher.process(10.0 + i, payment_type, timeout=1.0)
+                outcome = "paid"
+            except GatewayError:
+                outcome = "gateway_error"
+            except (DispatchRejected, TimeoutError):
+                outcome = "rejected"
+                time.sleep(0.01)
+            with outcomes_lock:
+                outcomes[payment_type][outcome] += 1
+
+    start = time.perf_counter()
+    clients = [threading.Thread(target=client, args=(payment_type, 100)) for payment_type in fakes for _ in range(4)]
+    for thread in clients:
+        thread.start()
+    time.sleep(0.3)
+    fakes["paypal"].inject(latency=0.2, failure_rate=0.7)  # PayPal slows down and starts failing
+    time.sleep(1.0)
+    fakes["paypal"].inject(latency=0.002, failure_rate=0.0)  # ...and recovers
+    # A burst far above crypto's rate limit: the queue fills and the excess is refused at once
+    burst = []
+    for i in range(200):
+        try:
+            burst.append(dispatcher.submit(1.0, "crypto", timeout=0))
+        except QueueFullError:
+            pass
+    for future in burst:
+        future.result()
+    for thread in clients:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    dispatcher.close()
+
+    metrics = dispatcher.to_dict()
+    for payment_type, lane in metrics.items():
+        print(f"{payment_type:12} {outcomes[payment_type]}  circuit opened {lane['circuit_opened']}x, "
+              f"now {lane['circuit']}; max queue depth {lane['max_queue_depth']}; "
+              f"mean latency {lane['latency']['mean_seconds'] * 1000:.1f} ms; "
+              f"gateway calls {fakes[payment_type].calls}; rejected {lane['rejected']}")
+    print(f"finished in {elapsed:.2f}s")
+    if "--json" in sys.argv:
+        print(json.dumps(metrics, indent=4))
+    if "--prometheus" in sys.argv:
+        print(dispatcher.to_prometheus())
+    healthy = all(metrics[payment_type]["circuit_opened"] == 0 for payment_type in ("credit_card", "crypto")) \
+        and metrics["crypto"]["rejected"]["queue_full"] > 0
+    sys.exit(0 if healthy and metrics["paypal"]["circuit_opened"] and metrics["paypal"]["circuit"] == CLOSED else 1)
@@ -0,0 +1,240 @@
+"""Low-overhead sampling profiler with flamegraph output.
+
+A background thread wakes every ``interval`` seconds, grabs the stack of the
+profiled thread from ``sys._current_frames()`` and counts identical stacks.
+Nothing is traced between samples, so the cost is one short stack walk per
+interval regardless of how much Python code runs.
+
+Output is chosen by file extension: ``.json`` writes a speedscope profile
+(https://www.speedscope.app), anything else writes collapsed stacks
+(``frame;frame;frame count``) for flamegraph.pl / inferno.
+
+    with profile("report.folded"):
+        generate_sales_report(data, "html", "report.html")
+
+To profile a fraction of hot-path calls in a running service, set
+``DESIGNPATTERNS_PROFILE_RATE`` (e.g. ``0.01``) and optionally
+``DESIGNPATTERNS_PROFILE_DIR``. Every entry point (``builder_service.py``,
+the bulk builders and the factory demos) calls ``install_from_env()`` at startup,
+which does nothing while the variable is unset. Other programs call it themselves,
+or ``install(rate, output_dir)``; importing this module installs nothing. To
+profile a whole script:
+
+    python DesignPatterns/profiling.py -o run.json builder/bulk_computer_builder.py 100000
+"""
+import argparse
+import functools
+import inspect
+import json
+import os
+import random
+import runpy
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from instrumentation import add_pattern_paths
+
+DEFAULT_INTERVAL = 0.005
+PROFILE_RATE_ENV = "DESIGNPATTERNS_PROFILE_RATE"
+PROFILE_DIR_ENV = "DESIGNPATTERNS_PROFILE_DIR"
+
+Frame = Tuple[str, str, int]  # (function, file, first line)
+
+
+# Profiler: Samples one thread's stack on a timer and aggregates identical stacks
+class SamplingProfiler:
+    def __init__(self, interval: float = DEFAULT_INTERVAL, thread_id: Optional[int] = None, name: str = "profile"):
+        if interval <= 0:
+            raise ValueError(f"Sampling interval must be positive: {interval}")
+        self.interval = interval
+        self.thread_id = thread_id
+        self.name = name
+        self.samples: Counter = Counter()
+        self.started_at = 0.0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        if self._sampler is not None:
+            raise ValueError("Profiler already started")
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self.started_at = time.perf_counter()
+        self._sampler = threading.Thread(target=self._run, name=f"sampler-{self.name}", daemon=True)
+        self._sampler.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+            self.duration = time.perf_counter() - self.started_at
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                return
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            stack.reverse()
+            self.samples[tuple(stack)] += 1
+
+    def collapsed(self) -> str:
+        lines = []
+        for stack, hits in sorted(self.samples.items()):
+            frames = ";".join(f"{function} ({os.path.basename(filename)}:{line})"
+                              for function, filename, line in stack)
+            lines.append(f"{frames} {hits}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def speedscope(self) -> Dict:
+        frame_index: Dict[Frame, int] = {}
+        samples: List[List[int]] = []
+        weights: List[float] = []
+        for stack, hits in self.samples.items():
+            samples.append([frame_index.setdefault(frame, len(frame_index)) for frame in stack])
+            weights.append(hits * self.interval)
+        frames = [{"name": function, "file": filename, "line": line}
+                  for (function, filename, line), _ in sorted(frame_index.items(), key=lambda item: item[1])]
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "exporter": "DesignPatterns profiling",
+            "name": self.name,
+            "shared": {"frames": frames},
+            "profiles": [{"type": "sampled", "name": self.name, "unit": "seconds", "startValue": 0,
+                          "endValue": sum(weights), "samples": samples, "weights": weights}],
+        }
+
+    def write(self, path: str):
+        with open(path, "w") as f:
+            if path.endswith(".json"):
+                json.dump(self.speedscope(), f)
+            else:
+                f.write(self.collapsed())
+
+
+@contextmanager
+def profile(output_path: Optional[str] = None, interval: float = DEFAULT_INTERVAL,
+            name: str = "profile") -> Iterator[SamplingProfiler]:
+    """Sample the current thread for the duration of the block; write to ``output_path`` if given."""
+    profiler = SamplingProfiler(interval, name=name).start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        if output_path:
+            profiler.write(output_path)
+
+
+def _sampled(function: Callable, name: str, rate: float, output_dir: str, interval: float) -> Callable:
+    def output_path() -> str:
+        return os.path.join(output_dir, f"{name}-{os.getpid()}-{time.time_ns()}.folded")
+
+    if inspect.isgeneratorfunction(function):
+        @functools.wraps(function)
+        def generator_wrapper(*args, **kwargs):
+            if random.random() >= rate:
+                return (yield from function(*args, **kwargs))
+            with profile(name=name, interval=interval) as profiler:
+                result = yield from function(*args, **kwargs)
+            if profiler.samples:
+                profiler.write(output_path())
+            return result
+        return generator_wrapper
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if random.random() >= rate:
+            return function(*args, **kwargs)
+        with profile(name=name, interval=interval) as profiler:
+            result = function(*args, **kwargs)
+        # Calls shorter than one interval produce no samples and no file
+        if profiler.samples:
+            profiler.write(output_path())
+        return result
+    return wrapper
+
+
+# Hot paths profiled by install(): (module, attribute path)
+HOT_PATHS = (
+    ("Document_generator_with_factory", "generate_sales_report"),
+    ("Dynamic_factory_class_creation", "DynamicClassFactory._load_config"),
+    ("bulk_computer_builder", "BulkComputerBuilder.build_all"),
+    ("computer_search", "ConfigurationSearch.search"),
+    ("meal_plan_optimizer", "MealPlanOptimizer.optimize"),
+    ("bulk_meal_planner", "PopulationMealPlanner.run"),
+)
+
+_installed: List[Tuple[object, str, object]] = []
+
+
+def install(rate: Optional[float] = None, output_dir: Optional[str] = None,
+            interval: float = DEFAULT_INTERVAL) -> int:
+    """Profile a ``rate`` fraction of calls on every importable hot path; returns how many were hooked."""
+    rate = float(os.environ.get(PROFILE_RATE_ENV, 0)) if rate is None else rate
+    output_dir = output_dir or os.environ.get(PROFILE_DIR_ENV, "profiles")
+    if not 0 < rate <= 1:
+        raise ValueError(f"Profile rate must be in (0, 1]: {rate}")
+    os.makedirs(output_dir, exist_ok=True)
+    uninstall()
+    add_pattern_paths()  # install() imports the hot path modules, which import their siblings by name
+    main_file = getattr(sys.modules.get("__main__"), "__file__", None) or ""
+    for module_name, attribute_path in HOT_PATHS:
+        # A module run as a script is __main__; hook that copy, it is the one the script uses
+        if os.path.basename(main_file) == module_name + ".py":
+            owner = sys.modules["__main__"]
+        else:
+            try:
+                owner = __import__(module_name)
+            except ImportError:
+                continue
+        *owners, attribute = attribute_path.split(".")
+        for owner_name in owners:
+            owner = getattr(owner, owner_name)
+        original = owner.__dict__[attribute] if isinstance(owner, type) else getattr(owner, attribute)
+        setattr(owner, attribute, _sampled(original, attribute_path, rate, output_dir, interval))
+        _installed.append((owner, attribute, original))
+    return len(_installed)
+
+
+def install_from_env() -> int:
+    """``install()`` configured from the environment when DESIGNPATTERNS_PROFILE_RATE is set; otherwise 0."""
+    return install() if os.environ.get(PROFILE_RATE_ENV) else 0
+
+
+def uninstall():
+    while _installed:
+        owner, attribute, original = _installed.pop()
+        setattr(owner, attribute, original)
+
+
+
+# Example usage: profile a whole script
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a Python script under the sampling profiler")
+    parser.add_argument("-o", "--output", default="profile.folded",
+                        help="output file; .json for speedscope, anything else for collapsed stacks")
+    parser.add_argument("-i", "--interval", type=float, default=DEFAULT_INTERVAL)
+    parser.add_argument("script")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    script = os.path.abspath(args.script)
+    sys.argv = [script] + args.args
+    sys.path.insert(0, os.path.dirname(script))
+    with profile(args.output, args.interval, name=os.path.basename(script)) as profiler:
+        try:
+            runpy.run_path(script, run_name="__main__")
+        finally:
+            print(f"{sum(profiler.samples.values())} samples written to {args.output}", file=sys.stderr)
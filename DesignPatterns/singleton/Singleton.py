@@ -16,7 +16,8 @@ class Singelton_Service_One(metaclass=SingletonMeta):
         self.counter = 0
         self.start_time = datetime.now()
 
-    def get_count_info(self, current_time=datetime.now()):
+    def get_count_info(self, current_time=None):
+        current_time = current_time or datetime.now()
         return f"Counter: {self.counter}, " \
                f"Start Time: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}," \
                f"End Time: {current_time.strftime('%Y-%m-%d %H:%M:%S')}"
@@ -28,7 +29,8 @@ class Singelton_Service_Two(metaclass=SingletonMeta):
         self.counter = 0
         self.start_time = datetime.now()
 
-    def get_count_info(self, current_time=datetime.now()):
+    def get_count_info(self, current_time=None):
+        current_time = current_time or datetime.now()
         return f"Counter: {self.counter}, " \
                f"Start Time: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}," \
                f"End Time: {current_time.strftime('%Y-%m-%d %H:%M:%S')}"
@@ -39,26 +41,25 @@ class Singelton_Service_Three(metaclass=SingletonMeta):
         self.value = value
         self.counter = 0
         self.start_time = datetime.now()
-    def get_count_info(self,current_time=datetime.now()):
+    def get_count_info(self,current_time=None):
+        current_time = current_time or datetime.now()
         return f"Counter: {self.counter}, " \
                f"Start Time: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}," \
                f"End Time: {current_time.strftime('%Y-%m-%d %H:%M:%S')}"
 
-s11 = Singelton_Service_One("Singleton Service call One")
-s21 = Singelton_Service_Two("Singleton Service call Two")
-s31 = Singelton_Service_Three("Singleton Service call Three")
-for i in range(10):
-    s11.counter += 1
-    print(s11.get_count_info(datetime.now()))
-    if i % 2 == 0:
-        time.sleep(1)
-        s21.counter += 1
-        print(s21.get_count_info(datetime.now()))
-    if i % 3 == 0:
-        time.sleep(2)
-        s31.counter += 1
-        print(s31.get_count_info(datetime.now()))
-
-
-
-
+# Example usage
+if __name__ == "__main__":
+    s11 = Singelton_Service_One("Singleton Service call One")
+    s21 = Singelton_Service_Two("Singleton Service call Two")
+    s31 = Singelton_Service_Three("Singleton Service call Three")
+    for i in range(10):
+        s11.counter += 1
+        print(s11.get_count_info(datetime.now()))
+        if i % 2 == 0:
+            time.sleep(1)
+            s21.counter += 1
+            print(s21.get_count_info(datetime.now()))
+        if i % 3 == 0:
+            time.sleep(2)
+            s31.counter += 1
+            print(s31.get_count_info(datetime.now()))
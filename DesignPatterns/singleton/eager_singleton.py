@@ -18,18 +18,19 @@ class EagerSingleton:
 # Create the singleton instance eagerly (thread-safe)
 with EagerSingleton._lock:
     if EagerSingleton._instance is None:
-        EagerSingleton._instance = super().__new__(EagerSingleton)
+        EagerSingleton._instance = object.__new__(EagerSingleton)
         # Initialize with default or desired parameters here if needed
         EagerSingleton._instance.__init__(value="Initial Value")
 
 # Usage example
-s1 = EagerSingleton()
-s2 = EagerSingleton()
+if __name__ == "__main__":
+    s1 = EagerSingleton()
+    s2 = EagerSingleton()
 
-print(s1 is s2)           # True
-print(s1.value)           # Initial Value
-print(s2.value)           # Initial Value
+    print(s1 is s2)           # True
+    print(s1.value)           # Initial Value
+    print(s2.value)           # Initial Value
 
-# Changing value via one reference affects the other
-s1.value = "Changed"
-print(s2.value)           # Changed
+    # Changing value via one reference affects the other
+    s1.value = "Changed"
+    print(s2.value)           # Changed
@@ -18,17 +18,18 @@ def create_instance():
     instances.append(instance)
     print(f"Instance ID: {id(instance)}")
 
-threads = []
-for _ in range(10):
-    t = threading.Thread(target=create_instance)
-    threads.append(t)
-    t.start()
-
-for t in threads:
-    t.join()
-
-unique_instances = set(instances)
-print(f"Number of unique instances created: {len(unique_instances)}")
+if __name__ == "__main__":
+    threads = []
+    for _ in range(10):
+        t = threading.Thread(target=create_instance)
+        threads.append(t)
+        t.start()
+
+    for t in threads:
+        t.join()
+
+    unique_instances = set(instances)
+    print(f"Number of unique instances created: {len(unique_instances)}")
 
 # OUTPUT MULTIPLE INSTANCES RACE CONDITIONS
 """
@@ -17,14 +17,15 @@ def create_singleton_instance():
     instance = Singleton()
     print(f"Instance ID: {id(instance)}")
 
-threads = []
-for _ in range(10):
-    t = threading.Thread(target=create_singleton_instance)
-    threads.append(t)
-    t.start()
+if __name__ == "__main__":
+    threads = []
+    for _ in range(10):
+        t = threading.Thread(target=create_singleton_instance)
+        threads.append(t)
+        t.start()
 
-for t in threads:
-    t.join()
+    for t in threads:
+        t.join()
 # OUTPUT WILL HAVE ONLY ONE INSTANCE ID :-
 """Instance ID: 2793158591120
 Instance ID: 2793158591120
@@ -0,0 +1,88 @@
+"""Startup budget check: import every pattern module under ``-X importtime``.
+
+    python benchmarks/import_budget.py                  # check against the default budget
+    python benchmarks/import_budget.py --budget-ms 30   # tighter budget for every module
+
+Each module is imported in a fresh interpreter. The check fails (exit status 1)
+when a module's cumulative import time is over budget, when importing it prints
+anything (a demo running at top level), or when the import itself fails. The
+modules are those in the pattern folders plus the top-level ones in DesignPatterns
+(instrumentation, profiling, payment_dispatch, ...). The profiling environment
+variables are cleared, so every module is measured as a plain import.
+Third-party packages are not installed for this check to pass: heavy backends
+such as reportlab must only be imported on first use.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGES = ("builder", "factory", "singleton")
+PATH = os.pathsep.join([os.path.join(ROOT, "DesignPatterns")]
+                       + [os.path.join(ROOT, "DesignPatterns", package) for package in PACKAGES])
+
+# Cumulative import time allowed per module, in milliseconds
+DEFAULT_BUDGET_MS = 50.0
+# Modules with a budget of their own; the service mode needs asyncio at startup, and the
+# dispatcher needs concurrent.futures (which pulls in logging) for the futures it returns
+MODULE_BUDGETS_MS: Dict[str, float] = {"builder_service": 120.0, "payment_dispatch": 80.0}
+
+
+def pattern_modules() -> List[str]:
+    modules = []
+    for directory in [os.path.join(ROOT, "DesignPatterns")] + [os.path.join(ROOT, "DesignPatterns", package)
+                                                               for package in PACKAGES]:
+        modules.extend(sorted(name[:-3] for name in os.listdir(directory) if name.endswith(".py")))
+    return modules
+
+
+def measure(module: str) -> Tuple[Optional[float], str, str]:
+    """Return (cumulative import ms or None on failure, captured stdout, error text)."""
+    env = {name: value for name, value in os.environ.items() if not name.startswith("DESIGNPATTERNS_PROFILE")}
+    env.update(PYTHONPATH=PATH, PYTHONDONTWRITEBYTECODE="1")
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               capture_output=True, text=True, env=env, cwd=ROOT)
+    if completed.returncode != 0:
+        return None, completed.stdout, completed.stderr.strip().splitlines()[-1]
+    cumulative = None
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if name == module:
+            cumulative = int(cumulative_us) / 1000
+    return cumulative, completed.stdout, ""
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time budget check for the pattern modules")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("modules", nargs="*", help="modules to check (default: all pattern modules)")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for module in args.modules or pattern_modules():
+        budget = MODULE_BUDGETS_MS.get(module, args.budget_ms)
+        elapsed, output, error = measure(module)
+        if elapsed is None:
+            status = f"FAILED to import: {error}"
+        elif output:
+            status = f"PRINTS on import ({len(output.splitlines())} lines)"
+        elif elapsed > budget:
+            status = f"OVER budget of {budget:.0f} ms"
+        else:
+            status = "ok"
+        failures += status != "ok"
+        shown = f"{elapsed:9.1f} ms" if elapsed is not None else "        - ms"
+        print(f"{module:35} {shown}  {status}")
+    if failures:
+        print(f"\n{failures} module(s) failed the startup budget")
+        return 1
+    print("\nAll modules within the startup budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Overhead budget check: time whole builds with and without ``instrumentation.enable()``.
+
+    python benchmarks/instrumentation_overhead.py                 # default instrumentation, 1% budget
+    python benchmarks/instrumentation_overhead.py --budget 0.02   # allow 2%
+    python benchmarks/instrumentation_overhead.py --steps         # also time every builder step
+
+Bare and instrumented runs alternate for ``--rounds`` rounds and the fastest run of each
+side is compared, so a change in machine load during the check affects both sides alike.
+The check fails (exit status 1) when any build is slower by more than the budget.
+"""
+import argparse
+import sys
+import timeit
+from typing import Callable, Dict, List, Optional, Tuple
+
+from scenarios import quiet_import
+
+DEFAULT_BUDGET = 0.01
+COMPUTER_SPEC = {"computer_type": "desktop", "cpu": "Intel Core i9-13900K", "motherboard": "ASUS ROG Z790",
+                 "ram": "32GB DDR5", "storage": "1TB NVMe SSD", "graphics_card": "NVIDIA RTX 4090",
+                 "power_supply": "850W PSU", "cooling_system": "Liquid Cooling"}
+MEAL_PLAN_SPEC = {"plan_type": "standard", "dietary_preference": "vegan", "breakfast": "Vegan Oatmeal",
+                  "lunch": "Tofu Stir-Fry", "dinner": "Tofu Stir-Fry", "snacks": ["Fruit Salad"]}
+
+
+def builds() -> Dict[str, Callable[[], object]]:
+    computers = quiet_import("builder_computer")
+    meal_plans = quiet_import("meal_planner_builder")
+    # Looked up on every call, so the instrumented run picks up the patched methods
+    return {
+        "computer.build_from_spec": lambda: computers.ComputerDirector.build_from_spec(COMPUTER_SPEC),
+        "computer.director_high_end": lambda: computers.ComputerDirector.build_high_end_desktop(
+            computers.DesktopBuilder()),
+        "meal_plan.build_from_spec": lambda: meal_plans.MealPlanDirector.build_from_spec(MEAL_PLAN_SPEC),
+    }
+
+
+def measure(build: Callable[[], object], enable: Callable[[], object], disable: Callable[[], None],
+            rounds: int) -> Tuple[float, float]:
+    """Return the fastest (bare, instrumented) seconds per build."""
+    timer = timeit.Timer(build)
+    number, _ = timer.autorange()
+    bare = instrumented = float("inf")
+    for _ in range(rounds):
+        bare = min(bare, timer.timeit(number) / number)
+        enable()
+        try:
+            instrumented = min(instrumented, timer.timeit(number) / number)
+        finally:
+            disable()
+    return bare, instrumented
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Instrumentation overhead check for whole builds")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="allowed slowdown, e.g. 0.01 for 1%%")
+    parser.add_argument("--sample-every", type=int, default=100)
+    parser.add_argument("--steps", action="store_true", help="instrument every builder step as well")
+    parser.add_argument("--rounds", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    instrumentation = quiet_import("instrumentation")
+    metrics = instrumentation.Instrumentation()
+    enable = lambda: instrumentation.enable(metrics, sample_every=args.sample_every, steps=args.steps)
+    failures = 0
+    for name, build in builds().items():
+        build()  # warm caches and lazy imports before timing
+        bare, instrumented = measure(build, enable, metrics.restore, args.rounds)
+        overhead = instrumented / bare - 1
+        status = "ok" if overhead <= args.budget else f"OVER budget of {args.budget:.1%}"
+        failures += status != "ok"
+        print(f"{name:30} {bare * 1e9:10,.1f} -> {instrumented * 1e9:10,.1f} ns/build {overhead:+8.2%}  {status}")
+    if failures:
+        print(f"\n{failures} build(s) over the instrumentation overhead budget")
+        return 1
+    print("\nAll builds within the instrumentation overhead budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""Run the DesignPatterns benchmark suite and compare it against a saved baseline.
+
+    python benchmarks/run_benchmarks.py                   # run everything, write benchmarks/results.json
+    python benchmarks/run_benchmarks.py -k singleton      # only scenarios whose name contains "singleton"
+    python benchmarks/run_benchmarks.py --save-baseline   # also store the results as the baseline
+    python benchmarks/run_benchmarks.py --compare         # flag scenarios slower than the baseline
+
+Timings use timeit: each scenario is auto-ranged to run for at least 0.2s, repeated,
+and the fastest repeat is reported as nanoseconds per operation. With --compare the
+exit status is 1 when any scenario regressed by more than --threshold. Memory scenarios
+also run once under tracemalloc and report peak bytes per operation.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+from scenarios import MEMORY_SCENARIOS, SCENARIOS
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RESULTS = os.path.join(BENCHMARK_DIR, "results.json")
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+
+
+def run_scenario(name: str, repeat: int) -> Dict:
+    run, operations, *teardown = SCENARIOS[name]()
+    try:
+        run()  # warm caches and lazy imports before timing
+        timer = timeit.Timer(run)
+        number, _ = timer.autorange()
+        timings = [elapsed / (number * operations) for elapsed in timer.repeat(repeat=repeat, number=number)]
+        peak = None
+        if name in MEMORY_SCENARIOS:
+            tracemalloc.start()
+            try:
+                run()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    finally:
+        for cleanup in teardown:
+            cleanup()
+    best = min(timings)
+    result = {"ns_per_op": round(best * 1e9, 1), "ops_per_sec": round(1 / best, 1),
+              "mean_ns_per_op": round(sum(timings) / len(timings) * 1e9, 1),
+              "operations": operations * number, "repeat": repeat}
+    if peak is not None:
+        result["peak_bytes_per_op"] = round(peak / operations)
+    return result
+
+
+def run_suite(selected: List[str], repeat: int) -> Dict:
+    results = {}
+    skipped = {}
+    for name in selected:
+        try:
+            results[name] = run_scenario(name, repeat)
+        except ImportError as e:
+            skipped[name] = str(e)
+            print(f"{name:55} skipped: {e}")
+            continue
+        memory = results[name].get("peak_bytes_per_op")
+        print(f"{name:55} {results[name]['ns_per_op']:>14,.1f} ns/op {results[name]['ops_per_sec']:>16,.1f} ops/s"
+              + (f" {memory:>10,} B/op" if memory is not None else ""))
+    return {
+        "meta": {"python": platform.python_version(), "implementation": platform.python_implementation(),
+                 "platform": platform.platform(), "cpu_count": os.cpu_count(),
+                 "timestamp": datetime.datetime.now().isoformat(timespec="seconds")},
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[Tuple[str, float, float, float]]:
+    """Return (name, baseline ns/op, current ns/op, relative change) for every regression above threshold."""
+    regressions = []
+    for name, result in sorted(current["results"].items()):
+        previous = baseline["results"].get(name)
+        if previous is None:
+            print(f"{name:55} new scenario, no baseline")
+            continue
+        change = result["ns_per_op"] / previous["ns_per_op"] - 1
+        flag = "REGRESSION" if change > threshold else ("improved" if change < -threshold else "ok")
+        print(f"{name:55} {previous['ns_per_op']:>12,.1f} -> {result['ns_per_op']:>12,.1f} ns/op "
+              f"{change:+8.1%}  {flag}")
+        if change > threshold:
+            regressions.append((name, previous["ns_per_op"], result["ns_per_op"], change))
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="DesignPatterns benchmark suite")
+    parser.add_argument("-k", "--filter", default="", help="only run scenarios whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=DEFAULT_RESULTS)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown, e.g. 0.10 for 10%%")
+    parser.add_argument("--list", action="store_true", help="list scenario names and exit")
+    args = parser.parse_args(argv)
+
+    selected = [name for name in SCENARIOS if args.filter in name]
+    if args.list:
+        print("\n".join(selected))
+        return 0
+
+    current = run_suite(selected, args.repeat)
+    with open(args.output, "w") as f:
+        json.dump(current, f, indent=4)
+    print(f"\nResults written to {args.output}")
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=4)
+        print(f"Baseline saved to {args.baseline}")
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"Error: no baseline at {args.baseline}; run with --save-baseline first")
+            return 2
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"\nComparing against {args.baseline} (threshold {args.threshold:.0%}):")
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} scenario(s) regressed by more than {args.threshold:.0%}")
+            return 1
+        print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,404 @@
+"""Benchmark scenarios covering every pattern module in DesignPatterns.
+
+Each scenario is a setup function registered with ``@scenario(name)``. Setup
+returns ``(run, operations)``: the runner times ``run()`` and divides by
+``operations`` to report a per-operation cost. A setup that changes global
+state may return ``(run, operations, teardown)``; teardown runs afterwards. A setup that raises
+ImportError is reported as skipped (e.g. reportlab not installed). Scenarios registered with
+``memory=True`` also report the peak bytes ``run()`` allocates per operation.
+"""
+import atexit
+import contextlib
+import functools
+import importlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from typing import Callable, Dict, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "DesignPatterns"))
+for _package in ("builder", "factory", "singleton"):
+    _path = os.path.join(ROOT, "DesignPatterns", _package)
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+WORKDIR = tempfile.mkdtemp(prefix="designpatterns-bench-")
+atexit.register(shutil.rmtree, WORKDIR, True)
+
+Setup = Callable[[], Tuple]
+SCENARIOS: Dict[str, Setup] = {}
+MEMORY_SCENARIOS = set()
+
+
+def scenario(name: str, memory: bool = False):
+    def register(setup: Setup) -> Setup:
+        SCENARIOS[name] = setup
+        if memory:
+            MEMORY_SCENARIOS.add(name)
+        return setup
+    return register
+
+
+def quiet_import(module_name: str):
+    """Import a pattern module with any demo output it prints discarded."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return importlib.import_module(module_name)
+
+
+def quiet(run: Callable[[], object]) -> Callable[[], None]:
+    def wrapper():
+        with contextlib.redirect_stdout(io.StringIO()):
+            run()
+    return wrapper
+
+
+# Singletons: instance lookup with 8 threads calling the class at once
+def _contended(lookup: Callable[[], object], threads: int = 8, per_thread: int = 5000):
+    def worker(barrier: threading.Barrier):
+        barrier.wait()
+        for _ in range(per_thread):
+            lookup()
+
+    def run():
+        barrier = threading.Barrier(threads)
+        pool = [threading.Thread(target=worker, args=(barrier,)) for _ in range(threads)]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+    return run, threads * per_thread
+
+
+@scenario("singleton.metaclass.contended_lookup")
+def _metaclass_singleton():
+    module = quiet_import("Singleton")
+    return _contended(lambda: module.Singelton_Service_One("benchmark"))
+
+
+@scenario("singleton.threadsafe.contended_lookup")
+def _threadsafe_singleton():
+    return _contended(quiet_import("threadsafe_singleton").Singleton)
+
+
+@scenario("singleton.thread_unsafe.contended_lookup")
+def _thread_unsafe_singleton():
+    return _contended(quiet_import("thread_unsafe_singleton").UnsafeSingleton)
+
+
+@scenario("singleton.eager.contended_lookup")
+def _eager_singleton():
+    return _contended(quiet_import("eager_singleton").EagerSingleton)
+
+
+# Factories: lookup/dispatch cost only, no processing or file output
+@scenario("factory.payment.dispatch")
+def _payment_dispatch():
+    get_processor = quiet_import("factory").PaymentProcessorFactory.get_payment_processor
+    payment_types = ("credit_card", "paypal", "crypto") * 100
+
+    def run():
+        for payment_type in payment_types:
+            get_processor(payment_type)
+    return run, len(payment_types)
+
+
+# Round trip through the rate-limited dispatch queue to a no-op fake gateway
+@scenario("factory.payment.dispatch_queued")
+def _payment_dispatch_queued():
+    module = quiet_import("payment_dispatch")
+    fake = module.FakeProcessor()
+    dispatcher = module.PaymentDispatcher(get_processor=lambda payment_type: fake)
+    submit = dispatcher.submit
+    amounts = [10.0 + i for i in range(100)]
+
+    def run():
+        for future in [submit(amount, "credit_card") for amount in amounts]:
+            future.result()
+    return run, len(amounts), dispatcher.close
+
+
+@scenario("factory.document.dispatch")
+def _document_dispatch():
+    get_generator = quiet_import("Document_generator_with_factory").DocumentGeneratorFactory.get_document_generator
+    doc_types = ("pdf", "html", "text") * 100
+
+    def run():
+        for doc_type in doc_types:
+            get_generator(doc_type)
+    return run, len(doc_types)
+
+
+def _registry(scope: str):
+    module = quiet_import("factory_registry")
+    registry = module.FactoryRegistry("benchmark")
+    registry.register_many([(f"key_{i}", object, getattr(module, scope)) for i in range(3)])
+    return registry
+
+
+def _registry_lookup(scope: str) -> Setup:
+    def setup():
+        create = _registry(scope).create
+        keys = ("key_0", "KEY_1", "Key_2") * 100
+
+        def run():
+            for key in keys:
+                create(key)
+        return run, len(keys)
+    return setup
+
+
+for _scope in ("PER_CALL", "PER_THREAD", "SINGLETON"):
+    scenario(f"factory.registry.lookup.{_scope.lower()}")(_registry_lookup(_scope))
+
+
+@scenario("factory.registry.contended_lookup.singleton")
+def _registry_contended():
+    create = _registry("SINGLETON").create
+    return _contended(lambda: create("key_1"))
+
+
+@scenario("factory.registry.contended_lookup.while_registering")
+def _registry_while_registering():
+    registry = _registry("SINGLETON")
+    stop = threading.Event()
+
+    def writer():
+        generation = 0
+        while not stop.is_set():
+            registry.register(f"temp_{generation % 64}", object, replace=True)
+            generation += 1
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+
+    def teardown():
+        stop.set()
+        thread.join()
+    run, operations = _contended(lambda: registry.create("key_1"))
+    return run, operations, teardown
+
+
+def sales_data(item_count: int) -> Dict:
+    items = [{"name": f"Item {i}", "quantity": i % 7 + 1, "price": 9.99 + i % 50} for i in range(item_count)]
+    return {"date": "2025-06-11", "total_sales": sum(item["quantity"] * item["price"] for item in items),
+            "items": items}
+
+
+def _document_generation(doc_type: str, item_count: int) -> Setup:
+    def setup():
+        module = quiet_import("Document_generator_with_factory")
+        generator = module.DocumentGeneratorFactory.get_document_generator(doc_type)
+        data = sales_data(item_count)
+        output_path = os.path.join(WORKDIR, f"report_{item_count}.{doc_type}")
+        return quiet(lambda: generator.generate(data, output_path)), 1
+    return setup
+
+
+for _doc_type, _sizes in (("text", (10, 1_000, 10_000)), ("html", (10, 1_000, 10_000)), ("pdf", (10, 1_000))):
+    for _size in _sizes:
+        scenario(f"factory.document.generate.{_doc_type}.{_size}_items")(_document_generation(_doc_type, _size))
+
+
+# Chunked rendering on a process pool; the pool is started in setup and kept across runs
+def _parallel_report(transfer: str) -> Setup:
+    def setup():
+        module = quiet_import("parallel_report")
+        renderer = module.ParallelReportRenderer(chunk_size=25_000, transfer=transfer)
+        data = sales_data(100_000)
+        renderer.render(data, "text")
+        return (lambda: renderer.render(data, "text")), len(data["items"]), renderer.close
+    return setup
+
+
+scenario("factory.document.parallel.text.100000_items.pickled")(_parallel_report("pickled"))
+scenario("factory.document.parallel.text.100000_items.shared")(_parallel_report("shared"))
+
+
+def dynamic_config(class_count: int, methods_per_class: int = 2, path: str = None, unique_bodies: bool = False) -> str:
+    """Write a DynamicClassFactory config with ``class_count`` classes, sharing method bodies unless ``unique_bodies``."""
+    config = {"classes": [{
+        "name": f"Api{i}",
+        "attributes": {"api_key": f"key_{i}", "endpoint": f"https://api{i}.example.com/v1/chat"},
+        "methods": {f"method_{m}": f"return f'response {i if unique_bodies else m}: {{message}}'"
+                    for m in range(methods_per_class)}
+    } for i in range(class_count)]}
+    path = path or os.path.join(WORKDIR, f"dynamic_{class_count}{'_unique' if unique_bodies else ''}.json")
+    with open(path, "w") as f:
+        json.dump(config, f)
+    return path
+
+
+@scenario("factory.dynamic.load_200_classes")
+def _dynamic_load():
+    factory_class = quiet_import("Dynamic_factory_class_creation").DynamicClassFactory
+    config_path = dynamic_config(200)
+    return (lambda: factory_class(config_path)), 200
+
+
+# Compile cache emptied before every load: duplicate bodies are compiled once per load, unique ones every time
+def _dynamic_load_cold(unique_bodies: bool) -> Setup:
+    def setup():
+        factory_class = quiet_import("Dynamic_factory_class_creation").DynamicClassFactory
+        cache_clear = quiet_import("method_compiler").cache_clear
+        config_path = dynamic_config(200, unique_bodies=unique_bodies)
+
+        def run():
+            cache_clear()
+            factory_class(config_path)
+        return run, 200
+    return setup
+
+
+scenario("factory.dynamic.load_200_classes.cold_cache")(_dynamic_load_cold(False))
+scenario("factory.dynamic.load_200_classes.unique_bodies")(_dynamic_load_cold(True))
+
+
+@scenario("factory.dynamic.create_instance")
+def _dynamic_create():
+    factory = quiet_import("Dynamic_factory_class_creation").DynamicClassFactory(dynamic_config(20))
+    names = factory.get_available_classes() * 10
+
+    def run():
+        for name in names:
+            factory.create_instance(name, api_key="override")
+    return run, len(names)
+
+
+# Builders and directors
+@scenario("builder.computer.director_high_end")
+def _computer_director():
+    module = quiet_import("builder_computer")
+    return (lambda: module.ComputerDirector.build_high_end_desktop(module.DesktopBuilder())), 1
+
+
+@scenario("builder.computer.director_high_end.instrumented")
+def _computer_director_instrumented():
+    instrumentation = quiet_import("instrumentation")
+    module = quiet_import("builder_computer")
+    metrics = instrumentation.enable(instrumentation.Instrumentation(), sample_every=100)
+    return (lambda: module.ComputerDirector.build_high_end_desktop(module.DesktopBuilder())), 1, metrics.restore
+
+
+# Per-step timing is opt-in; see benchmarks/instrumentation_overhead.py for the check against the budget
+@scenario("builder.computer.director_high_end.instrumented_steps")
+def _computer_director_instrumented_steps():
+    instrumentation = quiet_import("instrumentation")
+    module = quiet_import("builder_computer")
+    metrics = instrumentation.enable(instrumentation.Instrumentation(), sample_every=100, steps=True)
+    return (lambda: module.ComputerDirector.build_high_end_desktop(module.DesktopBuilder())), 1, metrics.restore
+
+
+# Builds/sec for fresh builders, and what each one costs in memory while all of them are alive.
+# Builders share the catalog, so a builder is little more than its Computer.
+def _builders(computer_type: str, count: int = 1000) -> Setup:
+    def setup():
+        module = quiet_import("builder_computer")
+        builder_class = module.DesktopBuilder if computer_type == "desktop" else module.LaptopBuilder
+        build = (module.ComputerDirector.build_high_end_desktop if computer_type == "desktop"
+                 else module.ComputerDirector.build_standard_laptop)
+
+        def run():
+            builders = [builder_class() for _ in range(count)]
+            for builder in builders:
+                build(builder)
+        return run, count
+    return setup
+
+
+scenario("builder.computer.build_1000.desktop", memory=True)(_builders("desktop"))
+scenario("builder.computer.build_1000.laptop", memory=True)(_builders("laptop"))
+
+
+@scenario("builder.computer.preset_cached")
+def _computer_preset():
+    director = quiet_import("builder_computer").ComputerDirector
+    return (lambda: director.preset("high_end_desktop").to_json()), 1
+
+
+@scenario("builder.computer.bulk_1000_specs")
+def _computer_bulk():
+    module = quiet_import("bulk_computer_builder")
+    specs = [quiet_import("builder_computer").ComputerDirector.preset(name).to_dict()
+             for name in ("high_end_desktop", "budget_desktop", "standard_laptop")] * 334
+    return (lambda: module.build_chunk(specs)), len(specs)
+
+
+@scenario("builder.computer.search_100_parts")
+def _computer_search():
+    module = quiet_import("computer_search")
+    search = module.ConfigurationSearch("Desktop", module.synthetic_catalog(100))
+    return (lambda: search.top_under_budget(4000, limit=10)), 1
+
+
+@scenario("builder.meal.director_gluten_free")
+def _meal_director():
+    module = quiet_import("meal_planner_builder")
+    return (lambda: module.MealPlanDirector.build_gluten_free_plan(module.StandardMealPlanBuilder())), 1
+
+
+@scenario("builder.meal.edit_undo")
+def _meal_edit_undo():
+    module = quiet_import("meal_planner_builder")
+    builder = module.StandardMealPlanBuilder()
+    module.MealPlanDirector.build_gluten_free_plan(builder)
+    return (lambda: builder.set_breakfast("Nuts").undo()), 2
+
+
+# A 100k-meal catalog: compatibility checks are bit tests and builders share the catalog, so neither grows with it
+@functools.lru_cache(maxsize=None)
+def meal_catalog(meal_count: int):
+    return quiet_import("meal_plan_optimizer").synthetic_nutrition_catalog(meal_count)
+
+
+@scenario("builder.meal.catalog_100k.compatibility_check")
+def _meal_compatibility():
+    catalog = meal_catalog(100_000)
+    is_compatible = catalog.is_compatible
+    checks = [(meal_id, preference) for meal_id in range(0, 100_000, 400)
+              for preference in ("vegan", "keto", "gluten-free", "none")]
+
+    def run():
+        for meal_id, preference in checks:
+            is_compatible(meal_id, preference)
+    return run, len(checks)
+
+
+@scenario("builder.meal.catalog_100k.build_plan")
+def _meal_build_large_catalog():
+    builder_class = quiet_import("meal_planner_builder").StandardMealPlanBuilder
+    catalog = meal_catalog(100_000)
+    vegan = [name for meal_id, name in enumerate(catalog.meal_names) if catalog.is_compatible(meal_id, "vegan")]
+    breakfast, lunch, dinner, snack = vegan[0], vegan[len(vegan) // 3], vegan[2 * len(vegan) // 3], vegan[-1]
+
+    def run():
+        (builder_class(catalog).set_dietary_preference("vegan").set_breakfast(breakfast).set_lunch(lunch)
+         .set_dinner(dinner).add_snack(snack).build())
+    return run, 1
+
+
+@scenario("builder.meal.optimize_20k_meals")
+def _meal_optimizer():
+    module = quiet_import("meal_plan_optimizer")
+    optimizer = module.MealPlanOptimizer(module.synthetic_nutrition_catalog(20_000))
+    optimizer.optimize("vegan", 2000)
+    return (lambda: optimizer.optimize("vegan", 1800)), 1
+
+
+@scenario("builder.record_store.write_10k")
+def _record_store():
+    module = quiet_import("record_store")
+    record = quiet_import("builder_computer").ComputerDirector.preset("high_end_desktop")
+    path = os.path.join(WORKDIR, "records.jsonl")
+
+    def run():
+        for suffix in ("", module.INDEX_SUFFIX):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        with module.RecordWriter(path) as writer:
+            writer.write_many(record for _ in range(10_000))
+    return run, 10_000
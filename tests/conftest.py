@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The pattern modules import their siblings by name, so each folder goes on the path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _path in ("DesignPatterns", "DesignPatterns/builder", "DesignPatterns/factory", "DesignPatterns/singleton"):
+    _path = os.path.join(ROOT, _path)
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
@@ -0,0 +1,56 @@
+import pickle
+
+import pytest
+
+from builder_computer import Computer, ComputerDirector, DesktopBuilder, FrozenComputer
+from bulk_computer_builder import build_chunk
+
+HIGH_END = ComputerDirector.preset("high_end_desktop").to_dict()
+
+
+@pytest.mark.parametrize("spec", [
+    [1],
+    "desktop",
+    None,
+    {**HIGH_END, "cpu": ["Intel Core i9-13900K"]},
+    {**HIGH_END, "ram": {"size": 32}},
+    {**HIGH_END, "storage": 512},
+])
+def test_malformed_spec_is_a_value_error(spec):
+    with pytest.raises(ValueError):
+        ComputerDirector.build_from_spec(spec)
+
+
+def test_malformed_spec_does_not_abort_the_batch():
+    results = build_chunk([HIGH_END, [1], {**HIGH_END, "graphics_card": ["x"]}, HIGH_END])
+    assert [type(result) for result in results] == [Computer, ValueError, ValueError, Computer]
+
+
+def test_preset_is_cached_and_frozen():
+    preset = ComputerDirector.preset("budget_desktop")
+    assert isinstance(preset, FrozenComputer)
+    assert ComputerDirector.preset("budget_desktop") is preset
+    assert preset.to_dict() == ComputerDirector.build_budget_desktop(DesktopBuilder()).to_dict()
+    with pytest.raises(ValueError, match="Unknown preset"):
+        ComputerDirector.preset("gaming_tower")
+
+
+def test_frozen_computer_cannot_be_changed():
+    preset = ComputerDirector.preset("high_end_desktop")
+    with pytest.raises(AttributeError, match="immutable"):
+        preset.cpu = "Intel Core i5-12400"
+    with pytest.raises(AttributeError, match="immutable"):
+        del preset.ram
+    preset.to_dict()["cpu"] = "Intel Core i5-12400"  # callers get their own dict
+    assert preset.cpu == "Intel Core i9-13900K"
+    assert preset.to_dict() == HIGH_END
+    assert preset.freeze() is preset
+    assert pickle.loads(pickle.dumps(preset)).to_dict() == HIGH_END
+
+
+def test_copy_of_a_frozen_computer_is_editable():
+    preset = ComputerDirector.preset("high_end_desktop")
+    custom = preset.copy()
+    assert type(custom) is Computer
+    custom.ram = "64GB DDR5"
+    assert preset.ram == "32GB DDR5"
@@ -0,0 +1,46 @@
+import asyncio
+import json
+
+import pytest
+
+from builder_service import handle_line, start_http_server
+
+
+@pytest.mark.parametrize("request_body", [
+    {"type": "computer", "spec": [1]},
+    {"type": "computer", "spec": "desktop"},
+    {"type": "computer", "spec": {"computer_type": "desktop", "cpu": ["x"]}},
+    {"type": "meal_plan", "spec": [1]},
+    {"type": "meal_plan", "spec": {"snacks": "Nuts"}},
+    {"type": "meal_plan", "spec": {"breakfast": ["Vegan Oatmeal"]}},
+    {"type": "meal_plan", "spec": {"dietary_preference": ["vegan"], "lunch": "Tofu Stir-Fry"}},
+    {"type": "meal_plan_optimize", "calorie_target": "2000"},
+])
+def test_malformed_requests_get_an_error_response(request_body):
+    response = handle_line(json.dumps({"id": 7, **request_body}).encode())
+    assert response["id"] == 7 and response["ok"] is False and response["error"]
+    assert "Unsupported" not in response["error"] and "unhashable" not in response["error"]
+
+
+def test_http_connection_survives_a_malformed_request():
+    async def exchange():
+        server = await start_http_server("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            statuses = []
+            for request in ({"type": "computer", "spec": [1]}, {"type": "computer_preset", "name": "budget_desktop"}):
+                body = json.dumps(request).encode()
+                writer.write(f"POST /build HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+                await writer.drain()
+                statuses.append(await reader.readline())
+                length = 0
+                while (line := await reader.readline()) != b"\r\n":
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                statuses.append(json.loads(await reader.readexactly(length))["ok"])
+            writer.close()
+            await writer.wait_closed()
+            return statuses
+
+    assert asyncio.run(exchange()) == [b"HTTP/1.1 200 OK\r\n", False, b"HTTP/1.1 200 OK\r\n", True]
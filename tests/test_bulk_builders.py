@@ -0,0 +1,30 @@
+import pytest
+
+from batching import chunked, map_in_order
+from bulk_meal_planner import PopulationMealPlanner, plans_for_user
+
+
+@pytest.mark.parametrize("record", [
+    {"user_id": 1, "calorie_target": "2000"},
+    {"user_id": 1, "calorie_target": 2000, "days": "7"},
+    {"user_id": 1, "calorie_target": 2000, "macro_ratio": {"protein": "0.3"}},
+    {"user_id": 1, "calorie_target": 2000, "macro_ratio": [0.3, 0.4, 0.3]},
+    {"user_id": 1, "breakfast": ["x"]},
+    {"user_id": 1, "snacks": "Nuts"},
+    {"user_id": 1, "plan_type": ["premium"], "calorie_target": 2000},
+])
+def test_malformed_user_records_become_error_rows(record):
+    [row] = plans_for_user(record)
+    assert row["user_id"] == 1 and "error" in row
+
+
+def test_malformed_records_do_not_stop_the_run(tmp_path):
+    records = [{"user_id": 0, "calorie_target": "2000"}, [1, 2], {"user_id": 2, "calorie_target": 2000, "days": 2}]
+    reports = PopulationMealPlanner(chunk_size=2, report=False).run(records, str(tmp_path / "plans.jsonl"))
+    assert sum(report.errors for report in reports) == 2
+    assert sum(report.plans for report in reports) == 2
+
+
+def test_map_in_order_serial_and_chunked():
+    assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(map_in_order(pow, [(2, 3), (3, 2)], workers=0)) == [8, 9]
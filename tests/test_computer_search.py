@@ -0,0 +1,27 @@
+import json
+
+from builder_computer import COMPONENT_CATALOG, LaptopBuilder
+from computer_search import ConfigurationSearch, brute_force_search
+
+
+def configurations(computers):
+    return [json.dumps(computer.to_dict(), sort_keys=True) for computer in computers]
+
+
+def test_laptop_search_has_no_duplicate_configurations():
+    found = configurations(ConfigurationSearch("Laptop").cheapest(limit=10))
+    assert len(found) == len(set(found)) == 2
+    found = configurations(ConfigurationSearch("Laptop").top_under_budget(10_000, limit=10))
+    assert len(found) == len(set(found)) == 2
+
+
+def test_search_matches_brute_force():
+    for computer_type in ("Desktop", "Laptop"):
+        expected = brute_force_search(computer_type, COMPONENT_CATALOG, 2500, 10)
+        found = ConfigurationSearch(computer_type).top_under_budget(2500, limit=10)
+        assert [computer.price for computer in found] == [computer.price for computer in expected]
+
+
+def test_laptop_without_graphics_card_gets_integrated_graphics():
+    builder = LaptopBuilder().set_graphics_card(None)
+    assert builder.computer.graphics_card == "Integrated Graphics"
@@ -0,0 +1,82 @@
+import threading
+import time
+from collections import Counter
+
+from factory_registry import PER_CALL, PER_THREAD, SINGLETON, FactoryRegistry
+
+THREADS = 6
+LOOKUPS = 500
+
+
+def test_concurrent_lookups_while_registering():
+    constructed = Counter()
+    constructed_lock = threading.Lock()
+
+    def counted(name):
+        def construct():
+            time.sleep(0.001)  # widen the window in which racing threads could each build an instance
+            with constructed_lock:
+                constructed[name] += 1
+            return object()
+        return construct
+
+    registry = FactoryRegistry("service")
+    registry.register_many([("shared", counted("shared"), SINGLETON),
+                            ("local", counted("local"), PER_THREAD),
+                            ("fresh", object, PER_CALL)])
+    barrier = threading.Barrier(THREADS + 1)
+    stop = threading.Event()
+    errors = []
+    seen = []  # (shared, local) per reader, kept alive so the ids stay unique after the threads exit
+
+    def reader():
+        barrier.wait()
+        shared, local = registry.create("shared"), registry.create("local")
+        for i in range(LOOKUPS):
+            if registry.create("shared") is not shared or registry.create("local") is not local:
+                errors.append("cached instance changed")
+                return
+            registry.create("fresh")
+            try:
+                registry.create(f"temp_{i % 16}")
+            except ValueError:
+                pass  # temp keys come and go
+            # Each generation registers a pair with one table swap; seeing half of a pair is a bug
+            keys = set(registry.keys())
+            torn = [key for key in keys if key.startswith("pair_a_") and "pair_b_" + key[7:] not in keys]
+            if torn:
+                errors.append(f"half-applied registration: {torn[0]}")
+                return
+        seen.append((shared, local))
+
+    def writer():
+        barrier.wait()
+        generation = 0
+        while not stop.is_set():
+            registry.register(f"temp_{generation % 16}", object, replace=True)
+            if generation % 2:
+                registry.unregister(f"temp_{generation % 16}")
+            pair = generation % 16
+            registry.register_many([(f"pair_a_{pair}", object, PER_CALL), (f"pair_b_{pair}", object, PER_CALL)],
+                                   replace=True)
+            if generation % 3 == 0:
+                registry.unregister(f"pair_a_{pair}")  # a before b, so a lone a is never a leftover
+                registry.unregister(f"pair_b_{pair}")
+            generation += 1
+            time.sleep(0)  # let the readers run between swaps instead of waiting out the switch interval
+
+    readers = [threading.Thread(target=reader) for _ in range(THREADS)]
+    writer_thread = threading.Thread(target=writer)
+    for thread in readers + [writer_thread]:
+        thread.start()
+    for thread in readers:
+        thread.join()
+    stop.set()
+    writer_thread.join()
+
+    assert errors == []
+    assert len(seen) == THREADS
+    assert constructed["shared"] == 1
+    assert len({id(shared) for shared, _ in seen}) == 1
+    assert constructed["local"] == THREADS
+    assert len({id(local) for _, local in seen}) == THREADS
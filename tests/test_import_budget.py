@@ -0,0 +1,12 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_every_module_imports_within_the_startup_budget():
+    completed = subprocess.run([sys.executable, os.path.join(ROOT, "benchmarks", "import_budget.py")],
+                               capture_output=True, text=True, cwd=ROOT)
+    assert completed.returncode == 0, completed.stdout + completed.stderr
+    assert "All modules within the startup budget" in completed.stdout
@@ -0,0 +1,64 @@
+import threading
+
+import instrumentation
+from instrumentation import Histogram, Instrumentation
+
+
+class Widget:
+    def ping(self):
+        return True
+
+
+def test_call_count_is_exact_across_threads():
+    histogram = Histogram("op")
+
+    def worker():
+        for _ in range(10_000):
+            histogram.count_call()
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert histogram.count == 80_000
+    assert histogram.to_dict()["count"] == 80_000
+
+
+def test_enable_updates_sampling_of_existing_histograms():
+    metrics = Instrumentation()
+    metrics.instrument(Widget, "ping")
+    try:
+        widget = Widget()
+        for _ in range(10):
+            widget.ping()
+        instrumentation.enable(metrics, sample_every=5)
+        for _ in range(10):
+            widget.ping()
+    finally:
+        metrics.restore()
+    histogram = metrics.histograms["Widget.ping"]
+    assert histogram.sample_every == 5
+    assert (histogram.count, histogram.sampled) == (20, 12)
+
+
+def test_enable_times_whole_builds_and_leaves_steps_alone():
+    from builder_computer import ComputerDirector, DesktopBuilder
+    metrics = instrumentation.enable(Instrumentation())
+    try:
+        ComputerDirector.build_high_end_desktop(DesktopBuilder())
+    finally:
+        metrics.restore()
+    assert metrics.histograms["ComputerDirector.build_high_end_desktop"].count == 1
+    assert not any(operation.endswith(".set_cpu") for operation in metrics.histograms)
+
+
+def test_enable_with_steps_times_every_builder_step():
+    from builder_computer import ComputerDirector, DesktopBuilder
+    metrics = instrumentation.enable(Instrumentation(), steps=True)
+    try:
+        ComputerDirector.build_high_end_desktop(DesktopBuilder())
+    finally:
+        metrics.restore()
+    assert metrics.histograms["DesktopBuilder.set_cpu"].count == 1
+    assert metrics.histograms["ComputerDirector.build_high_end_desktop"].count == 1
@@ -0,0 +1,62 @@
+import pytest
+
+from meal_plan_optimizer import KCAL_PER_GRAM, MealPlanOptimizer, synthetic_nutrition_catalog
+from meal_planner_builder import NUTRITION_CATALOG, NutritionCatalog, PremiumMealPlanBuilder
+
+CATALOG = synthetic_nutrition_catalog(2000, seed=3)
+
+
+def meals(plan):
+    return [plan.breakfast, plan.lunch, plan.dinner, *plan.snacks]
+
+
+def score(plan, calorie_target, ratio):
+    """L1 distance between the plan's (kcal, protein kcal, carbs kcal, fat kcal) and the target."""
+    total = sum(ratio.values())
+    distance = abs(plan.total_calories - calorie_target)
+    for macro, kcal_per_gram in zip(NutritionCatalog.MACROS, KCAL_PER_GRAM):
+        distance += abs(plan.macros[macro] * kcal_per_gram - calorie_target * ratio[macro] / total)
+    return distance
+
+
+@pytest.mark.parametrize("preference", ["vegan", "keto", "gluten-free", "none"])
+def test_plans_come_back_best_first(preference):
+    ratio = {"protein": 0.25, "carbs": 0.5, "fat": 0.25}
+    plans = MealPlanOptimizer(CATALOG).optimize(preference, 2200, ratio, top_k=8)
+    assert len(plans) == 8
+    scores = [score(plan, 2200, ratio) for plan in plans]
+    assert scores == sorted(scores)
+
+
+@pytest.mark.parametrize("preference", ["vegan", "keto", "gluten-free"])
+def test_every_meal_fits_the_dietary_preference(preference):
+    plans = MealPlanOptimizer(CATALOG).optimize(preference, 1800, builder_class=PremiumMealPlanBuilder, top_k=10)
+    assert plans
+    for plan in plans:
+        assert plan.dietary_preference == preference
+        for meal in meals(plan):
+            assert CATALOG.is_compatible(CATALOG.meal_ids[meal], preference), f"{meal} is not {preference}"
+
+
+def test_preference_without_compatible_meals_gives_no_plans():
+    catalog = NutritionCatalog(NUTRITION_CATALOG.meal_data, {"vegan": ["Vegan Oatmeal"], "keto": []})
+    assert MealPlanOptimizer(catalog).optimize("keto", 2000) == []
+
+
+def test_top_k_larger_than_the_candidates_returns_each_plan_once():
+    # Two keto meals: 4 sets of three mains, each with 6 snack sets of up to two snacks
+    plans = MealPlanOptimizer().optimize("keto", 2000, top_k=1000)
+    assert len(plans) == 4 * 6
+    assert len({(plan.breakfast, plan.lunch, plan.dinner, tuple(sorted(plan.snacks))) for plan in plans}) == 4 * 6
+    scores = [score(plan, 2000, {"protein": 0.3, "carbs": 0.4, "fat": 0.3}) for plan in plans]
+    assert scores == sorted(scores)
+
+
+def test_invalid_arguments_are_rejected():
+    optimizer = MealPlanOptimizer()
+    with pytest.raises(ValueError):
+        optimizer.optimize("vegan", 0)
+    with pytest.raises(ValueError):
+        optimizer.optimize("vegan", 2000, top_k=0)
+    with pytest.raises(ValueError, match="Unsupported dietary preference"):
+        optimizer.optimize("paleo", 2000)
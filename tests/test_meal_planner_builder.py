@@ -0,0 +1,152 @@
+import random
+import time
+
+import pytest
+
+from meal_planner_builder import NUTRITION_CATALOG, NutritionCatalog, PremiumMealPlanBuilder, StandardMealPlanBuilder
+
+MEALS = list(NUTRITION_CATALOG.meal_names)
+PREFERENCES = ["vegan", "keto", "gluten-free", "none"]
+
+
+def recomputed_totals(plan):
+    """Calories and macros summed from scratch over every meal in the plan."""
+    calories = 0
+    macros = {"protein": 0, "carbs": 0, "fat": 0}
+    for meal in [plan.breakfast, plan.lunch, plan.dinner, *plan.snacks]:
+        if meal is not None:
+            data = NUTRITION_CATALOG.meal_data[meal]
+            calories += data["calories"]
+            for macro in macros:
+                macros[macro] += data["macros"][macro]
+    return calories, macros
+
+
+def random_edit(builder, rng):
+    plan = builder.meal_plan
+    action = rng.randrange(8)
+    if action == 0:
+        builder.set_dietary_preference(rng.choice(PREFERENCES))
+    elif action == 1:
+        builder.set_breakfast(rng.choice(MEALS))
+    elif action == 2:
+        builder.set_lunch(rng.choice(MEALS))
+    elif action == 3:
+        builder.set_dinner(rng.choice(MEALS))
+    elif action == 4:
+        builder.add_snack(rng.choice(MEALS))
+    elif action == 5 and plan.snacks:
+        builder.remove_snack(rng.choice(plan.snacks))
+    elif action == 6:
+        builder.undo()
+    else:
+        builder.redo()
+
+
+@pytest.mark.parametrize("builder_class", [StandardMealPlanBuilder, PremiumMealPlanBuilder])
+def test_random_edits_match_totals_recomputed_from_scratch(builder_class):
+    rng = random.Random(20_000)
+    builder = builder_class()
+    for step in range(20_000):
+        try:
+            random_edit(builder, rng)
+        except ValueError:
+            pass  # incompatible meal, snack limit or an empty undo/redo stack; the plan must be unchanged
+        plan = builder.meal_plan
+        assert (plan.total_calories, plan.macros) == recomputed_totals(plan), f"totals drifted at step {step}"
+
+
+def test_replacing_a_meal_does_not_double_count():
+    builder = StandardMealPlanBuilder()
+    builder.set_breakfast("Vegan Oatmeal").set_breakfast("Fruit Salad")
+    assert builder.meal_plan.total_calories == 150
+    assert builder.meal_plan.macros == {"protein": 2, "carbs": 35, "fat": 1}
+
+
+def test_remove_snack_undo_and_redo():
+    builder = StandardMealPlanBuilder()
+    builder.add_snack("Nuts").add_snack("Protein Bar").add_snack("Nuts")
+    builder.remove_snack("Protein Bar")
+    assert builder.meal_plan.snacks == ["Nuts", "Nuts"]
+    assert builder.meal_plan.total_calories == 400
+    builder.undo()
+    assert builder.meal_plan.snacks == ["Nuts", "Protein Bar", "Nuts"]
+    builder.redo()
+    assert builder.meal_plan.snacks == ["Nuts", "Nuts"]
+    with pytest.raises(ValueError):
+        builder.redo()
+    with pytest.raises(ValueError):
+        builder.remove_snack("Fruit Salad")
+
+
+def test_new_edit_clears_redo():
+    builder = StandardMealPlanBuilder()
+    builder.set_lunch("Tofu Stir-Fry").undo()
+    builder.set_dinner("Salmon with Quinoa")
+    with pytest.raises(ValueError, match="Nothing to redo"):
+        builder.redo()
+
+
+def test_undo_restores_dietary_preference():
+    builder = StandardMealPlanBuilder()
+    builder.set_dietary_preference("keto").set_dietary_preference("vegan").undo()
+    assert builder.meal_plan.dietary_preference == "keto"
+    with pytest.raises(ValueError):
+        builder.set_breakfast("Vegan Oatmeal")
+
+
+def test_copy_is_independent_and_diff_lists_changed_fields():
+    builder = StandardMealPlanBuilder()
+    builder.set_breakfast("Vegan Oatmeal").add_snack("Nuts")
+    original = builder.meal_plan.copy()
+    builder.add_snack("Fruit Salad")
+    assert original.snacks == ["Nuts"]
+    diff = original.diff(builder.meal_plan)
+    assert set(diff) == {"snacks", "total_calories", "macros"}
+    assert diff["total_calories"] == (500, 650)
+    assert original.diff(original.copy()) == {}
+
+
+def test_edit_latency_is_constant_in_plan_size():
+    def mean_edit_seconds(snacks: int) -> float:
+        builder = StandardMealPlanBuilder()
+        for _ in range(snacks):
+            builder.add_snack("Nuts")
+        start = time.perf_counter()
+        for _ in range(2_000):
+            builder.set_breakfast("Vegan Oatmeal")
+            builder.undo()
+        return (time.perf_counter() - start) / 4_000
+
+    small, large = mean_edit_seconds(10), mean_edit_seconds(10_000)
+    assert small < 50e-6
+    # A replacement touches one meal's contribution, however many snacks the plan holds
+    assert large < small * 5
+
+
+def test_catalog_lookups_by_id_match_the_meal_data():
+    for name, data in NUTRITION_CATALOG.meal_data.items():
+        meal_id = NUTRITION_CATALOG.meal_ids[name]
+        assert NUTRITION_CATALOG.meal_names[meal_id] == name
+        assert NUTRITION_CATALOG.calories[meal_id] == data["calories"]
+        assert list(NUTRITION_CATALOG.macros[meal_id * 3:meal_id * 3 + 3]) == [
+            data["macros"][macro] for macro in NutritionCatalog.MACROS]
+
+
+def test_catalog_compatibility_matches_the_preference_lists():
+    for preference, compatible in NUTRITION_CATALOG.dietary_compatibility.items():
+        for name, meal_id in NUTRITION_CATALOG.meal_ids.items():
+            assert NUTRITION_CATALOG.is_compatible(meal_id, preference) == (name in compatible)
+    assert not NUTRITION_CATALOG.is_compatible(NUTRITION_CATALOG.meal_ids["Nuts"], "paleo")
+
+
+def test_catalog_ignores_unknown_meals_in_preference_lists_and_is_read_only():
+    catalog = NutritionCatalog({"Soup": {"calories": 120, "macros": {"protein": 4, "carbs": 15, "fat": 5}}},
+                               {"vegan": ["Soup", "Stew"], "keto": []})
+    assert catalog.is_compatible(0, "vegan")
+    assert not catalog.is_compatible(0, "keto")
+    assert "Stew" not in catalog.meal_ids
+    with pytest.raises(TypeError):
+        catalog.meal_ids["Stew"] = 1
+    with pytest.raises(TypeError):
+        catalog.meal_data["Stew"] = {}
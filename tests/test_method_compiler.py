@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from Dynamic_factory_class_creation import DynamicClassFactory
+from method_compiler import MethodCompileError, compile_method
+
+FRAME_ESCAPE = ("holder=[]; g=(holder[0].gi_frame.f_back.f_back.f_globals for x in [0]); holder.append(g); "
+                "found=list(g)[0]; return found['sys'].modules['os'].getcwd()")
+
+
+def write_config(tmp_path, body):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"classes": [{"name": "Api", "methods": {"run": body}}]}))
+    return str(path)
+
+
+def test_frame_escape_through_generator_is_rejected(tmp_path):
+    with pytest.raises(MethodCompileError, match="is not allowed"):
+        DynamicClassFactory(write_config(tmp_path, FRAME_ESCAPE))
+
+
+@pytest.mark.parametrize("body", [
+    "import os",
+    "return ().__class__",
+    "return '{0.__class__}'.format(self)",
+    "return open('x')",
+    "return eval('1')",
+    "return (x for x in [1]).gi_code",
+    "return self.run.func_globals",
+    "return self.f_back",
+    "return self.tb_next",
+    "return self.co_consts",
+    "return int.mro()",
+    "f = lambda: 1",
+])
+def test_unsafe_bodies_are_rejected(body):
+    with pytest.raises(MethodCompileError):
+        compile_method("Api.run", body)
+
+
+def test_free_names_become_parameters(tmp_path):
+    factory = DynamicClassFactory(write_config(tmp_path, "return f'reply: {message}'"))
+    assert factory.create_instance("Api").run("hi") == "reply: hi"
+
+
+def test_declared_parameters_reject_undefined_names():
+    with pytest.raises(MethodCompileError, match="undefined"):
+        compile_method("Api.run", "return message + other", ["message"])
+
+
+def test_generator_expressions_still_work():
+    total = compile_method("Api.total", "return sum(x * 2 for x in items)")
+    assert total(None, [1, 2, 3]) == 12
+
+
+def test_classes_is_read_only(tmp_path):
+    factory = DynamicClassFactory(write_config(tmp_path, "return message"))
+    with pytest.raises(TypeError):
+        factory.classes["Api"] = object
+    assert list(factory.classes) == ["Api"]
+
+
+@pytest.mark.parametrize("params", [["self"], ["m", "m"], "message", [1], ["_hidden"], ["class"], ["a b"], ("x", 2)])
+def test_invalid_declared_parameters_are_rejected(params):
+    with pytest.raises(MethodCompileError):
+        compile_method("Api.run", "return 1", params)
+
+
+def test_invalid_parameters_in_a_config_are_reported_with_the_method(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"classes": [{"name": "Api", "methods": {
+        "run": {"params": ["m", "m"], "body": "return m"}}}]}))
+    with pytest.raises(MethodCompileError, match="duplicate"):
+        DynamicClassFactory(str(path))
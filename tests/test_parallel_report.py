@@ -0,0 +1,59 @@
+import contextlib
+import io
+import os
+
+import pytest
+
+from Document_generator_with_factory import DocumentGeneratorFactory
+from parallel_report import ParallelReportRenderer, pack_items
+
+
+def sales_data(quantities):
+    items = [{"name": f"Item {i}", "quantity": quantity, "price": 9.99 + i} for i, quantity in enumerate(quantities)]
+    return {"date": "2025-06-11", "total_sales": sum(item["quantity"] * item["price"] for item in items),
+            "items": items}
+
+
+def serial_render(data, doc_type, path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        DocumentGeneratorFactory.get_document_generator(doc_type).generate(data, path)
+    with open(path) as f:
+        return f.read()
+
+
+def shm_segments():
+    return set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+
+
+def test_non_int_quantities_fail_before_creating_a_block():
+    before = shm_segments()
+    with pytest.raises(TypeError):
+        pack_items(sales_data([1, 2.5, 3])["items"])
+    assert shm_segments() == before
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_fractional_quantities_render_like_serial(tmp_path, workers):
+    data = sales_data([1, 2.5, 3, 0.25, 7])
+    expected = serial_render(data, "text", str(tmp_path / "serial.txt"))
+    with ParallelReportRenderer(workers=workers, chunk_size=2) as renderer:
+        assert renderer.render(data, "text") == expected
+
+
+def test_zero_workers_renders_in_process(tmp_path):
+    data = sales_data(range(10))
+    with ParallelReportRenderer(workers=0, chunk_size=3) as renderer:
+        assert renderer.render(data, "html") == serial_render(data, "html", str(tmp_path / "serial.html"))
+        assert renderer._executor is None
+
+
+@pytest.mark.parametrize("chunks_taken", [1, 2])
+def test_abandoned_render_leaves_no_segment(chunks_taken):
+    data = sales_data(range(50))
+    before = shm_segments()
+    with ParallelReportRenderer(workers=1, chunk_size=10) as renderer:
+        pieces = renderer.render_chunks(data, "text")
+        for _ in range(chunks_taken):  # the header alone, then the header and the first chunk
+            next(pieces)
+        pieces.close()
+        assert shm_segments() == before
@@ -0,0 +1,82 @@
+import pytest
+
+from payment_dispatch import CircuitBreaker, DispatchRejected, FakeProcessor, PaymentDispatcher
+
+
+class DecliningProcessor(FakeProcessor):
+    def process_payment(self, amount: float) -> bool:
+        super().process_payment(amount)
+        return False
+
+
+def test_declined_payments_count_as_failures():
+    breaker = lambda: CircuitBreaker(error_threshold=0.5, window=4, min_calls=4, reset_timeout=60)
+    processor = DecliningProcessor()
+    with PaymentDispatcher(workers_per_type=1, breaker_factory=breaker,
+                           get_processor=lambda payment_type: processor) as dispatcher:
+        for _ in range(4):
+            assert dispatcher.process(10.0, "paypal") is False
+        lane = dispatcher.to_dict()["paypal"]
+    assert lane["latency"]["errors"] == 4
+    assert lane["circuit"] == "open"
+
+
+def test_submit_after_close_is_rejected_for_existing_lanes():
+    processor = FakeProcessor()
+    dispatcher = PaymentDispatcher(get_processor=lambda payment_type: processor)
+    assert dispatcher.process(10.0, "paypal") is True
+    dispatcher.close()
+    with pytest.raises(DispatchRejected, match="closed"):
+        dispatcher.submit(10.0, "paypal")
+    with pytest.raises(DispatchRejected, match="closed"):
+        dispatcher.submit(10.0, "crypto")
+
+
+def test_request_queued_as_the_lane_stops_is_failed_not_left_pending():
+    processor = FakeProcessor()
+    dispatcher = PaymentDispatcher(workers_per_type=1, get_processor=lambda payment_type: processor)
+    dispatcher.process(10.0, "paypal")
+    lane = dispatcher._lanes["paypal"]
+    dispatcher.close()
+    # A submit that passed the closed check just before close() finished still gets an answer
+    lane.closed = False
+    future = lane.submit(10.0, None)
+    lane.closed = True
+    lane._fail_pending()
+    with pytest.raises(DispatchRejected):
+        future.result(timeout=1)
+
+
+def half_open_breaker():
+    now = [0.0]
+    breaker = CircuitBreaker(window=2, min_calls=2, reset_timeout=1.0, clock=lambda: now[0])
+    for _ in range(2):
+        breaker.record(0.0, True, breaker.allow())
+    assert breaker.state == "open"
+    now[0] = 5.0
+    return breaker
+
+
+def test_half_open_lets_one_trial_through():
+    breaker = half_open_breaker()
+    trial = breaker.allow()
+    assert trial is not None
+    assert breaker.allow() is None
+
+
+def test_release_by_a_call_without_the_trial_keeps_the_slot_taken():
+    breaker = half_open_breaker()
+    trial = breaker.allow()
+    breaker.release(object())  # e.g. a queued call from before the circuit opened being cancelled
+    assert breaker.allow() is None
+    breaker.release(trial)
+    assert breaker.allow() is not None
+
+
+def test_only_the_trial_outcome_decides_the_half_open_circuit():
+    breaker = half_open_breaker()
+    trial = breaker.allow()
+    breaker.record(0.0, False, object())  # a call admitted while the circuit was still closed
+    assert breaker.state == "half_open"
+    breaker.record(0.0, False, trial)
+    assert breaker.state == "closed"
@@ -0,0 +1,20 @@
+import profiling
+from meal_plan_optimizer import MealPlanOptimizer
+
+
+def test_install_from_env_does_nothing_without_the_variable(monkeypatch):
+    monkeypatch.delenv(profiling.PROFILE_RATE_ENV, raising=False)
+    assert profiling.install_from_env() == 0
+    assert not profiling._installed
+
+
+def test_install_from_env_hooks_the_hot_paths(monkeypatch, tmp_path):
+    original = MealPlanOptimizer.__dict__["optimize"]
+    monkeypatch.setenv(profiling.PROFILE_RATE_ENV, "0.5")
+    monkeypatch.setenv(profiling.PROFILE_DIR_ENV, str(tmp_path))
+    try:
+        assert profiling.install_from_env() > 0
+        assert MealPlanOptimizer.__dict__["optimize"] is not original
+    finally:
+        profiling.uninstall()
+    assert MealPlanOptimizer.__dict__["optimize"] is original
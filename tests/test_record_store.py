@@ -0,0 +1,71 @@
+import os
+
+from record_store import INDEX_SUFFIX, RecordReader, RecordWriter
+
+
+def write_records(path, start, stop):
+    with RecordWriter(path) as writer:
+        writer.write_many({"id": i} for i in range(start, stop))
+
+
+def read_ids(path):
+    with RecordReader(path) as reader:
+        return [record["id"] for record in reader]
+
+
+def test_reader_picks_up_records_missing_from_a_short_index(tmp_path):
+    path = str(tmp_path / "records.jsonl")
+    write_records(path, 0, 5)
+    with open(path + INDEX_SUFFIX, "r+b") as f:
+        f.truncate(2 * 8)  # writer crashed after flushing only two offsets
+    assert read_ids(path) == list(range(5))
+
+
+def test_reader_handles_index_from_an_unflushed_writer(tmp_path):
+    path = str(tmp_path / "records.jsonl")
+    write_records(path, 0, 3)
+    writer = RecordWriter(path)
+    writer.write_many({"id": i} for i in range(3, 6))
+    writer._file.flush()  # data reached the file, the index has not been written yet
+    try:
+        assert read_ids(path) == list(range(6))
+    finally:
+        writer.close()
+    assert read_ids(path) == list(range(6))
+
+
+def test_reader_rebuilds_index_that_does_not_fit_the_data(tmp_path):
+    path = str(tmp_path / "records.jsonl")
+    write_records(path, 0, 4)
+    with open(path + INDEX_SUFFIX, "ab") as f:
+        f.write((7).to_bytes(8, "little") + b"\x01\x02")  # mid-line offset and a half-written entry
+    assert read_ids(path) == list(range(4))
+
+
+def test_writer_repairs_short_index_before_appending(tmp_path):
+    path = str(tmp_path / "records.jsonl")
+    write_records(path, 0, 5)
+    with open(path + INDEX_SUFFIX, "r+b") as f:
+        f.truncate(8)
+    write_records(path, 5, 8)
+    assert os.path.getsize(path + INDEX_SUFFIX) == 8 * 8
+    with RecordReader(path) as reader:
+        assert [reader[i]["id"] for i in (0, 4, 5, -1)] == [0, 4, 5, 7]
+
+
+def test_writer_drops_a_torn_last_line_before_appending(tmp_path):
+    path = str(tmp_path / "records.jsonl")
+    write_records(path, 0, 3)
+    with open(path, "ab") as f:
+        f.write(b'{"id":3,"na')  # writer died halfway through a record
+    write_records(path, 99, 100)
+    assert read_ids(path) == [0, 1, 2, 99]
+
+
+def test_writer_handles_a_file_holding_only_a_torn_line(tmp_path):
+    path = str(tmp_path / "records.jsonl")
+    write_records(path, 0, 1)
+    with open(path, "wb") as f:
+        f.write(b'{"id":0')
+    write_records(path, 5, 7)
+    assert read_ids(path) == [5, 6]